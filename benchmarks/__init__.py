@@ -0,0 +1,42 @@
+"""
+Standalone benchmarks for the Task Manager API.
+
+Each module is run with ``python -m benchmarks.<name>`` from the project root.
+Benchmarks run against a throwaway test database, never the configured one.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - start
+
+
+def report(label, iterations, elapsed, unit='ops'):
+    rate = iterations / elapsed if elapsed else float('inf')
+    print(f'{label:<40} {rate:>12.1f} {unit}/s   {elapsed / iterations * 1000:>9.3f} ms/op')
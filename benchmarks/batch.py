@@ -0,0 +1,65 @@
+"""
+Resolving a list of task IDs: one GET /api/tasks/{id}/ per ID versus a single
+GET /api/tasks/batch/?ids=...
+
+    python -m benchmarks.batch [--ids N] [--comments N] [--iterations N]
+
+Both paths go through the full middleware stack and JWT authentication as a
+regular (non-admin) user, and report the SQL queries issued per resolution.
+"""
+import argparse
+
+from . import report, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ids', type=int, default=50)
+    parser.add_argument('--comments', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.urls import reverse
+    from tasks.models import Comment, Task
+    from users.tokens import RevocableRefreshToken
+
+    with test_database(), override_settings(ALLOWED_HOSTS=['testserver'], TASK_BATCH_MAX_IDS=max(args.ids, 100)):
+        user = get_user_model().objects.create_user(email='bench@example.com', full_name='Bench User', password='x')
+        tasks = Task.objects.bulk_create(
+            Task(title=f'Task {i}', description='Lorem ipsum dolor sit amet', assigned_to=user)
+            for i in range(args.ids)
+        )
+        Comment.objects.bulk_create(
+            Comment(task=task, author=user, content=f'Update {j}')
+            for task in tasks
+            for j in range(args.comments)
+        )
+        ids = [task.id for task in tasks]
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RevocableRefreshToken.for_user(user).access_token}')
+
+        def per_id():
+            for pk in ids:
+                assert client.get(reverse('task-detail', kwargs={'pk': pk})).status_code == 200
+
+        batch_url = reverse('task-batch')
+        query = {'ids': ','.join(map(str, ids))}
+
+        def batch():
+            assert client.get(batch_url, query).status_code == 200
+
+        for label, fn in [(f'{args.ids} x GET /api/tasks/{{id}}/', per_id), ('GET /api/tasks/batch/', batch)]:
+            queries = []
+            # CaptureQueriesContext would be reset by every request_started.
+            with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                fn()
+            elapsed = timed(fn, args.iterations)
+            report(f'{label} [{len(queries)} queries]', args.iterations, elapsed, 'lists')
+
+
+if __name__ == '__main__':
+    main()
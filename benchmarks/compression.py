@@ -0,0 +1,58 @@
+"""
+Bandwidth and CPU cost of each compression codec on /api/tasks/ pages.
+
+    python -m benchmarks.compression [--comments N] [--iterations N]
+
+Renders a default-sized task list page (PAGE_SIZE tasks with embedded
+comments) and reports compression ratio and compression throughput per codec
+and level: level 1, the default level, the /api/tasks/ route level and the
+maximum.
+"""
+import argparse
+
+from . import setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--comments', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+    from task_manager.compression import CODECS
+    from tasks.models import Comment, Task
+    from users.tokens import RevocableRefreshToken
+
+    with test_database():
+        user = get_user_model().objects.create_user(email='bench@example.com', full_name='Bench User', password='x', role='Admin')
+        tasks = Task.objects.bulk_create(
+            Task(title=f'Task {i}', description=f'Investigate issue #{i} reported by the support team.', assigned_to=user)
+            for i in range(settings.REST_FRAMEWORK['PAGE_SIZE'])
+        )
+        Comment.objects.bulk_create(
+            Comment(task=task, author=user, content=f'Status update {j}: still in progress.')
+            for task in tasks
+            for j in range(args.comments)
+        )
+        access = RevocableRefreshToken.for_user(user).access_token
+        body = Client().get(reverse('task-list'), HTTP_AUTHORIZATION=f'Bearer {access}').content
+        print(f'uncompressed page: {len(body)} bytes')
+
+        for name, codec in CODECS.items():
+            config = settings.RESPONSE_COMPRESSION
+            route_level = config['ROUTES'].get('/api/tasks/', {}).get(name, codec.max_level)
+            for level in sorted({1, config['LEVELS'][name], route_level, codec.max_level}):
+                size = len(codec.compress(body, level))
+                elapsed = timed(lambda: codec.compress(body, level), args.iterations)
+                per_page = elapsed / args.iterations
+                print(f'{name:>5} level {level:>2}: {size:>7} bytes ({size / len(body):6.1%})'
+                      f'   {per_page * 1000:7.3f} ms/page   {len(body) / per_page / 2**20:8.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
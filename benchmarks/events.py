@@ -0,0 +1,110 @@
+"""
+Load test for the task event stream: thousands of idle SSE connections.
+
+    python -m benchmarks.events [--connections N]
+
+Opens N event streams through the ASGI application (in-memory, no sockets),
+reports connect rate and memory per idle connection, then publishes one task
+update and measures how long it takes to reach every subscriber.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from . import setup_django, test_database
+
+
+class Connection:
+    def __init__(self, application, path, token):
+        self.disconnect = asyncio.get_running_loop().create_future()
+        self.received = asyncio.Event()
+        self.ready = asyncio.Event()
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': f'token={token}'.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        self.task = asyncio.ensure_future(application(scope, self.receive, self.send))
+        self._request_sent = False
+
+    async def receive(self):
+        if not self._request_sent:
+            self._request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnect
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.body':
+            body = message.get('body', b'')
+            if body.startswith(b'retry:'):
+                self.ready.set()
+            elif b'event: task.updated' in body:
+                self.received.set()
+
+    def close(self):
+        if not self.disconnect.done():
+            self.disconnect.set_result(None)
+
+
+async def run(connections):
+    from asgiref.sync import sync_to_async
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+    from task_manager.asgi import application
+    from tasks.events import broker
+    from tasks.models import Task
+    from users.tokens import RevocableRefreshToken
+
+    def create_fixture():
+        user = get_user_model().objects.create_user(email='bench@example.com', full_name='Bench User', password='x')
+        task = Task.objects.create(title='Watched task', description='Task', assigned_to=user)
+        return task, str(RevocableRefreshToken.for_user(user).access_token)
+
+    task, token = await sync_to_async(create_fixture)()
+    path = reverse('task-events')
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    streams = [Connection(application, path, token) for _ in range(connections)]
+    await asyncio.gather(*(stream.ready.wait() for stream in streams))
+    elapsed = time.perf_counter() - start
+    used = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename'))
+    tracemalloc.stop()
+    print(f'opened {connections} streams in {elapsed:.2f}s ({connections / elapsed:.0f}/s), '
+          f'{broker.subscriber_count()} subscribed')
+    print(f'memory per idle connection: {used / connections / 1024:.1f} KiB')
+
+    def update_task():
+        task.status = Task.Status.IN_PROGRESS
+        task.save()
+
+    start = time.perf_counter()
+    await sync_to_async(update_task)()
+    await asyncio.gather(*(stream.received.wait() for stream in streams))
+    elapsed = time.perf_counter() - start
+    print(f'fan-out of one update to {connections} subscribers: {elapsed * 1000:.1f} ms')
+
+    for stream in streams:
+        stream.close()
+    await asyncio.gather(*(stream.task for stream in streams), return_exceptions=True)
+    print(f'after disconnect: {broker.subscriber_count()} subscribed')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+
+    with test_database(), override_settings(TASK_EVENTS={'MAX_SUBSCRIBERS': args.connections}):
+        asyncio.run(run(args.connections))
+
+
+if __name__ == '__main__':
+    main()
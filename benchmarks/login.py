@@ -0,0 +1,70 @@
+"""
+Logins per second per core for each password hasher profile.
+
+    python -m benchmarks.login [--iterations N] [--threads N]
+
+Single-threaded throughput approximates one core, since the hash dominates
+the cost of a login. The threaded run shows how the hashing pool caps total
+throughput at PASSWORD_HASHING['POOL_WORKERS'] cores.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import report, setup_django, test_database
+
+
+def login_benchmark(profile, hashers, iterations, threads):
+    from django.contrib.auth import get_user_model
+    from django.db import close_old_connections
+    from django.test.utils import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    User = get_user_model()
+    with override_settings(PASSWORD_HASHERS=hashers):
+        email = f'bench-{profile}@example.com'
+        User.objects.create_user(email=email, full_name='Bench User', password='bench-password-123')
+        url = reverse('token_obtain_pair')
+        payload = {'email': email, 'password': 'bench-password-123'}
+
+        def login():
+            response = APIClient().post(url, payload, format='json')
+            assert response.status_code == 200, response.content
+
+        login()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            login()
+        report(f'{profile}: 1 thread (per core)', iterations, time.perf_counter() - start, 'logins')
+
+        if threads > 1:
+            def worker(_):
+                login()
+                close_old_connections()
+
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                start = time.perf_counter()
+                list(executor.map(worker, range(iterations)))
+                report(f'{profile}: {threads} threads', iterations, time.perf_counter() - start, 'logins')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    with test_database():
+        for profile, hashers in settings.PASSWORD_HASHER_PROFILES.items():
+            try:
+                login_benchmark(profile, hashers, args.iterations, args.threads)
+            except ValueError as exc:
+                print(f'{profile}: skipped ({exc})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Rendering throughput for a large task page with embedded comments.
+
+    python -m benchmarks.serialization [--tasks N] [--comments N] [--iterations N]
+
+Serializes the page once with TaskSerializer, then times each renderer on the
+resulting data, so the numbers isolate encoding cost.
+"""
+import argparse
+
+from . import report, setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=100)
+    parser.add_argument('--comments', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from rest_framework.renderers import JSONRenderer
+    from task_manager.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+    from tasks.models import Comment, Task
+    from tasks.serializers import TaskSerializer
+
+    with test_database():
+        user = get_user_model().objects.create_user(email='bench@example.com', full_name='Bench User', password='x')
+        tasks = Task.objects.bulk_create(
+            Task(title=f'Task {i}', description='Lorem ipsum dolor sit amet ' * 8, assigned_to=user)
+            for i in range(args.tasks)
+        )
+        Comment.objects.bulk_create(
+            Comment(task=task, author=user, content=f'Progress update {j} on {task.title}')
+            for task in tasks
+            for j in range(args.comments)
+        )
+        data = {'count': args.tasks, 'next': None, 'previous': None,
+                'results': TaskSerializer(Task.objects.all(), many=True).data}
+
+        renderers = [('JSONRenderer (stdlib)', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('FastJSONRenderer (orjson)', FastJSONRenderer()))
+        if msgpack is not None:
+            renderers.append(('MessagePackRenderer', MessagePackRenderer()))
+
+        for label, renderer in renderers:
+            size = len(renderer.render(data))
+            elapsed = timed(lambda: renderer.render(data), args.iterations)
+            report(f'{label} [{size / 1024:.0f} KiB]', args.iterations, elapsed, 'pages')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Read throughput of a file-backed SQLite database while comments are being
+written, with Django's default SQLite settings and with SQLITE_OPTIONS (WAL,
+tuned pragmas, BEGIN IMMEDIATE).
+
+    python -m benchmarks.sqlite_concurrency [--readers N] [--writers N] [--seconds S]
+
+Readers list a page of tasks; writers insert a comment inside a transaction
+that first reads its task, like CommentViewSet.create. Failed writes are
+"database is locked" errors.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from . import setup_django
+
+
+def run_mode(alias, readers, writers, seconds):
+    from django.db import DatabaseError, connections, transaction
+    from tasks.models import Comment, Task
+
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'failed': 0}
+    lock = threading.Lock()
+    task_ids = list(Task.objects.using(alias).values_list('id', flat=True))
+    author_id = Task.objects.using(alias).values_list('assigned_to_id', flat=True).first()
+
+    def count(key):
+        with lock:
+            counts[key] += 1
+
+    def reader():
+        while not stop.is_set():
+            list(Task.objects.using(alias).order_by('-created_at')[:20].values('id', 'title', 'status'))
+            count('reads')
+        connections[alias].close()
+
+    def writer(n):
+        i = 0
+        while not stop.is_set():
+            i += 1
+            try:
+                with transaction.atomic(using=alias):
+                    task = Task.objects.using(alias).get(pk=task_ids[(n + i) % len(task_ids)])
+                    Comment.objects.using(alias).create(task=task, author_id=author_id, content=f'Comment {n}-{i}')
+                count('writes')
+            except DatabaseError:
+                count('failed')
+        connections[alias].close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connections
+    from tasks.models import Task
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, options in [('default', {}), ('tuned', settings.SQLITE_OPTIONS)]:
+            alias = f'bench_{label}'
+            connections.settings[alias] = dict(
+                connections.settings['default'], NAME=os.path.join(directory, f'{label}.sqlite3'), OPTIONS=options
+            )
+            call_command('migrate', database=alias, verbosity=0)
+            user = get_user_model().objects.db_manager(alias).create_user(email='bench@example.com', full_name='Bench User', password='x')
+            Task.objects.using(alias).bulk_create(
+                Task(title=f'Task {i}', description='Task', assigned_to=user) for i in range(200)
+            )
+            connections[alias].close()
+
+            counts = run_mode(alias, args.readers, args.writers, args.seconds)
+            print(f'{label:<8} reads {counts["reads"] / args.seconds:>9.1f}/s   writes {counts["writes"] / args.seconds:>8.1f}/s'
+                  f'   failed writes {counts["failed"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Autocomplete latency of the user directory search.
+
+    python -m benchmarks.user_search [--users N] [--iterations N]
+
+Bulk-loads N users, then times the first page of GET /api/users/?search=...
+for a few typical terms, printing the SQLite query plan of each search.
+"""
+import argparse
+import random
+
+from . import report, setup_django, test_database, timed
+
+FIRST_NAMES = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elena']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=200_000)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.urls import reverse
+    from users.search import search_users
+    from users.tokens import RevocableRefreshToken
+
+    User = get_user_model()
+    with test_database(), override_settings(ALLOWED_HOSTS=['testserver']):
+        rng = random.Random(0)
+        batch = []
+        for i in range(args.users):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            batch.append(User(email=f'{first}.{last}{i}@example.com'.lower(), full_name=f'{first} {last} {i}', password='!'))
+            if len(batch) == 10_000:
+                User.objects.bulk_create(batch)
+                batch = []
+        User.objects.bulk_create(batch)
+        admin = User.objects.create_superuser(email='admin@example.com', full_name='Admin', password='x')
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RevocableRefreshToken.for_user(admin).access_token}')
+        url = reverse('user-list')
+
+        for term in ['ele', 'james.sm', 'Rodrig', 'davis 42', 'zzz']:
+            if connection.vendor == 'sqlite':
+                sql, params = search_users(User.objects.order_by('full_name', 'id'), term)[:20].query.sql_with_params()
+                with connection.cursor() as cursor:
+                    plan = cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+                print(f'{term!r}: ' + '; '.join(row[-1] for row in plan))
+            elapsed = timed(lambda: client.get(url, {'search': term}), args.iterations)
+            report(f'search={term!r} ({args.users} users)', args.iterations, elapsed, 'requests')
+
+
+if __name__ == '__main__':
+    main()
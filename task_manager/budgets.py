@@ -0,0 +1,213 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+# SQLite calls the progress handler every this many virtual machine
+# instructions, which bounds how late a timed-out statement is interrupted.
+PROGRESS_HANDLER_INSTRUCTIONS = 10000
+
+# Statements that manage transactions rather than do work for the view.
+TRANSACTION_STATEMENTS = ('SAVEPOINT', 'RELEASE', 'ROLLBACK', 'BEGIN', 'COMMIT')
+
+
+class QueryBudgetExceeded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'This request needed too many database queries.'
+    default_code = 'query_budget_exceeded'
+    wait = 1
+
+
+class StatementTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'A database query took too long, retry later.'
+    default_code = 'statement_timeout'
+    wait = 1
+
+
+def get_budget_settings(scopes):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    for scope in scopes:
+        if scope in budgets:
+            return scope, budgets[scope]
+    return None, None
+
+
+def metric_key(scope, kind):
+    return f'query-budget:{scope}:{kind}'
+
+
+def record_budget_fired(scope, kind):
+    # Kept in the cache so that, with a shared cache, the counts cover every
+    # worker. Only fired budgets are counted, not every request.
+    key = metric_key(scope, kind)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_budget_metrics():
+    return [
+        {
+            'scope': scope,
+            'max_queries': config.get('MAX_QUERIES'),
+            'statement_timeout': config.get('STATEMENT_TIMEOUT'),
+            'exceeded_queries': cache.get(metric_key(scope, 'queries'), 0),
+            'timeouts': cache.get(metric_key(scope, 'timeout'), 0),
+        }
+        for scope, config in getattr(settings, 'QUERY_BUDGETS', {}).items()
+    ]
+
+
+class QueryBudget:
+    """
+    Limits the queries a request may run on a connection, and how long each
+    statement may take, while installed as an execute wrapper.
+
+    The timeout is PostgreSQL's ``statement_timeout`` for the session, reset
+    when the budget is removed, or on SQLite a progress handler that
+    interrupts a statement once its deadline passes. Other databases only get
+    the query limit.
+    """
+
+    def __init__(self, connection, max_queries=None, statement_timeout=None):
+        self.connection = connection
+        self.max_queries = max_queries
+        self.statement_timeout = statement_timeout
+        self.queries = 0
+        self.fired = None
+        self.deadline = None
+        self._armed = False
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+        self.disarm()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip()[:9].upper().startswith(TRANSACTION_STATEMENTS):
+            self.queries += 1
+            if self.max_queries is not None and self.queries > self.max_queries:
+                self.fired = 'queries'
+                raise QueryBudgetExceeded()
+        if self.statement_timeout is not None:
+            self.arm(context['cursor'])
+        return execute(sql, params, many, context)
+
+    def arm(self, cursor):
+        vendor = self.connection.vendor
+        if vendor == 'sqlite':
+            # Reset per statement; rows fetched later count against the
+            # deadline of the statement that produced them.
+            self.deadline = time.monotonic() + self.statement_timeout
+            if not self._armed:
+                self.connection.connection.set_progress_handler(self.check_deadline, PROGRESS_HANDLER_INSTRUCTIONS)
+        elif vendor == 'postgresql' and not self._armed:
+            cursor.cursor.execute(f'SET statement_timeout = {int(self.statement_timeout * 1000)}')
+        self._armed = True
+
+    def disarm(self):
+        if not self._armed or self.connection.connection is None:
+            return
+        self._armed = False
+        if self.connection.vendor == 'sqlite':
+            self.connection.connection.set_progress_handler(None, 0)
+        elif self.connection.vendor == 'postgresql':
+            try:
+                with self.connection.connection.cursor() as cursor:
+                    cursor.execute('RESET statement_timeout')
+            except DatabaseError:
+                # E.g. inside an aborted transaction; don't let a pooled
+                # connection keep the short timeout.
+                self.connection.close()
+
+    def check_deadline(self):
+        if time.monotonic() > self.deadline:
+            self.fired = 'timeout'
+            return 1
+        return 0
+
+    def timed_out(self, exc):
+        if self.fired == 'timeout':
+            return True
+        # PostgreSQL: query_canceled, raised by statement_timeout.
+        cause = exc.__cause__
+        return getattr(cause, 'pgcode', None) == '57014' or getattr(cause, 'sqlstate', None) == '57014'
+
+
+class QueryBudgetMixin:
+    """
+    Applies the ``QUERY_BUDGETS`` entry for ``query_budget_scope`` (or for
+    ``<scope>.<action>``, when configured) to every request of a view.
+    Requests over budget get a 503 and are counted per scope.
+    """
+    query_budget_scope = None
+
+    def get_query_budget_scopes(self):
+        action = getattr(self, 'action', None)
+        if action:
+            return [f'{self.query_budget_scope}.{action}', self.query_budget_scope]
+        return [self.query_budget_scope]
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication and permission checks run before the budget starts.
+        super().initial(request, *args, **kwargs)
+        scope, config = get_budget_settings(self.get_query_budget_scopes())
+        if config is not None:
+            self.query_budget_name = scope
+            self.query_budget = QueryBudget(connection, config.get('MAX_QUERIES'), config.get('STATEMENT_TIMEOUT'))
+            self.query_budget.__enter__()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            budget = getattr(self, 'query_budget', None)
+            if budget is not None:
+                self.query_budget = None
+                budget.__exit__(None, None, None)
+
+    def handle_exception(self, exc):
+        budget = getattr(self, 'query_budget', None)
+        if budget is not None:
+            if isinstance(exc, DatabaseError) and budget.timed_out(exc):
+                exc = StatementTimeout()
+            if isinstance(exc, (QueryBudgetExceeded, StatementTimeout)):
+                kind = 'queries' if isinstance(exc, QueryBudgetExceeded) else 'timeout'
+                record_budget_fired(self.query_budget_name, kind)
+                logger.warning('Query budget %s fired (%s) on %s %s', self.query_budget_name, kind,
+                               self.request.method, self.request.path)
+        return super().handle_exception(exc)
+
+
+class QueryBudgetMetricsView(APIView):
+    @extend_schema(
+        summary="Query budget metrics",
+        description="Configured query budgets and how often each has fired (Admin only)",
+        responses=inline_serializer('QueryBudgetMetric', {
+            'scope': serializers.CharField(),
+            'max_queries': serializers.IntegerField(allow_null=True),
+            'statement_timeout': serializers.FloatField(allow_null=True, help_text="Seconds"),
+            'exceeded_queries': serializers.IntegerField(),
+            'timeouts': serializers.IntegerField(),
+        }, many=True)
+    )
+    def get(self, request):
+        if request.user.role != 'Admin':
+            return Response({'error': 'Only admins can view query budget metrics'}, status=status.HTTP_403_FORBIDDEN)
+        return Response(get_budget_metrics())
@@ -0,0 +1,146 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Streams returned by Codec.compressor(): compress() buffers, flush() emits
+# everything compressed so far as a decodable block (like GZipMiddleware's
+# Z_SYNC_FLUSH), finish() ends the stream.
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class GzipCodec:
+    name = 'gzip'
+    available = True
+    max_level = 9
+
+    def compress(self, data, level):
+        compressor = self.compressor(level)
+        return compressor.compress(data) + compressor.finish()
+
+    def compressor(self, level):
+        return _GzipStream(level)
+
+
+class _BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class BrotliCodec:
+    name = 'br'
+    available = brotli is not None
+    max_level = 11
+
+    def compress(self, data, level):
+        return brotli.compress(data, quality=level)
+
+    def compressor(self, level):
+        return _BrotliStream(level)
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class ZstdCodec:
+    name = 'zstd'
+    available = zstandard is not None
+    max_level = 19
+
+    def compress(self, data, level):
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def compressor(self, level):
+        return _ZstdStream(level)
+
+
+CODECS = {codec.name: codec for codec in (GzipCodec(), BrotliCodec(), ZstdCodec()) if codec.available}
+
+
+def parse_accept_encoding(header):
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            codings[coding.strip().lower()] = quality
+    return {coding for coding, quality in codings.items() if quality > 0}
+
+
+def negotiate_encoding(header, preference):
+    """
+    Return the first coding in ``preference`` that is installed and accepted
+    by the client's Accept-Encoding header, or None.
+    """
+    accepted = parse_accept_encoding(header)
+    for name in preference:
+        if name in accepted and name in CODECS:
+            return name
+    return None
+
+
+def compress_sequence(codec, level, sequence):
+    # Each chunk is flushed so streamed responses reach the client as they
+    # are produced instead of once the compressor's buffer fills.
+    compressor = codec.compressor(level)
+    for chunk in sequence:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def compress_async_sequence(codec, level, sequence):
+    compressor = codec.compressor(level)
+    async for chunk in sequence:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.schema import generate_schema, get_code_version, read_artifact, write_artifact
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema into the build artifact served by api/schema/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None, help='Artifact path (defaults to SCHEMA_CACHE["ARTIFACT"])')
+        parser.add_argument('--force', action='store_true', help='Regenerate even if the artifact is up to date')
+
+    def handle(self, *args, **options):
+        if not settings.API_DOCS_ENABLED:
+            raise CommandError('API docs are disabled (DJANGO_API_DOCS=0); the schema cannot be generated.')
+        path = options['file'] or settings.SCHEMA_CACHE['ARTIFACT']
+        if not path:
+            raise CommandError('No artifact path configured; pass --file or set SCHEMA_CACHE["ARTIFACT"].')
+
+        version = get_code_version()
+        if not options['force'] and read_artifact(path, version) is not None:
+            self.stdout.write(f'Schema artifact {path} is up to date (version {version}).')
+            return
+
+        write_artifact(path, version, generate_schema())
+        self.stdout.write(self.style.SUCCESS(f'Wrote schema artifact {path} (version {version}).'))
@@ -0,0 +1,108 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PHASE_MARKER = 'startup-report-phase:'
+
+# Runs in a fresh interpreter under -X importtime, so nothing is imported yet.
+# Phase markers on stderr split the import log between the phases.
+STARTUP_SCRIPT = """
+import json, sys, time
+
+marker, warmup = sys.argv[1], sys.argv[2] == '1'
+
+def mark(phase, started):
+    elapsed = time.perf_counter() - started
+    sys.stderr.write(marker + phase + '\\n')
+    sys.stderr.flush()
+    phases.append([phase, elapsed])
+    return time.perf_counter()
+
+phases = []
+started = time.perf_counter()
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+started = mark('settings', started)
+django.setup()
+started = mark('apps ready', started)
+from django.urls import get_resolver
+get_resolver().url_patterns
+started = mark('urlconf', started)
+timings = None
+if warmup:
+    from task_manager.startup import warm_up
+    timings = warm_up()
+    started = mark('warmup', started)
+print(json.dumps({'phases': phases, 'warmup': timings}))
+"""
+
+
+def parse_import_times(stderr):
+    """
+    Split ``-X importtime`` output into ``{phase: [(module, self_us, cumulative_us)]}``.
+    """
+    imports = defaultdict(list)
+    current = []
+    for line in stderr.splitlines():
+        if line.startswith(PHASE_MARKER):
+            imports[line[len(PHASE_MARKER):]] = current
+            current = []
+        elif line.startswith('import time:') and '|' in line:
+            self_us, cumulative_us, module = line[len('import time:'):].split('|')
+            if self_us.strip().isdigit():
+                current.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+class Command(BaseCommand):
+    help = 'Measure how long a fresh worker takes to import settings, load the apps and the URLconf.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Number of packages and modules to list per phase')
+        parser.add_argument('--warmup', action='store_true', help='Also time task_manager.startup.warm_up()')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT, PHASE_MARKER, '1' if options['warmup'] else '0'],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+            raise CommandError('Startup failed:\n' + '\n'.join(errors[-20:]))
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = parse_import_times(result.stderr)
+        top = options['top']
+
+        self.stdout.write(f"{'Phase':<12} {'Time (ms)':>10} {'Imports':>8}")
+        for phase, seconds in report['phases']:
+            self.stdout.write(f'{phase:<12} {seconds * 1000:>10.1f} {len(imports[phase]):>8}')
+        total = sum(seconds for _, seconds in report['phases'])
+        self.stdout.write(f"{'total':<12} {total * 1000:>10.1f} {sum(map(len, imports.values())):>8}")
+        if report['warmup']:
+            warmup = report['warmup']
+            self.stdout.write(
+                f"Warmup: {warmup['views']} views, {warmup['serializers']} serializers; "
+                f"resolver {warmup['resolver_seconds'] * 1000:.1f} ms, "
+                f"serializer fields {warmup['serializer_seconds'] * 1000:.1f} ms"
+            )
+
+        for phase, _ in report['phases']:
+            if not imports[phase]:
+                continue
+            packages = defaultdict(int)
+            for module, self_us, _ in imports[phase]:
+                packages[module.split('.')[0]] += self_us
+            self.stdout.write(f'\n{phase}: slowest packages (own import time)')
+            for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+                self.stdout.write(f'  {package:<40} {self_us / 1000:>8.1f} ms')
+            self.stdout.write(f'{phase}: slowest modules (including their imports)')
+            for module, _, cumulative_us in sorted(imports[phase], key=lambda item: -item[2])[:top]:
+                self.stdout.write(f'  {module:<40} {cumulative_us / 1000:>8.1f} ms')
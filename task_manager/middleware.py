@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.http import HttpResponse
+from django.middleware import csrf
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from users.hashers import HashingPoolBusy
+
+from .compression import CODECS, compress_async_sequence, compress_sequence, negotiate_encoding
+
+
+def is_api_request(request):
+    return request.path_info.startswith(tuple(settings.API_PATH_PREFIXES))
+
+
+class BrowserOnlyMiddlewareMixin:
+    """
+    Skips a browser-oriented middleware for API routes.
+
+    API requests authenticate with JWT through DRF, so sessions, messages and
+    CSRF cookies are pure overhead for them. Requests under
+    ``API_PATH_PREFIXES`` go straight to the next handler; other routes
+    (``admin/``) get the stock behaviour.
+    """
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(BrowserOnlyMiddlewareMixin, sessions_middleware.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(BrowserOnlyMiddlewareMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(BrowserOnlyMiddlewareMixin, auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(BrowserOnlyMiddlewareMixin, messages_middleware.MessageMiddleware):
+    pass
+
+
+class HashingPoolBusyMiddleware(MiddlewareMixin):
+    """
+    Answers 503 when the password hashing pool is saturated during a plain
+    Django view (the ``admin/`` login). DRF views turn ``HashingPoolBusy``
+    into a 503 themselves, so this only sees it from outside the API.
+    """
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, HashingPoolBusy):
+            return HttpResponse(exception.detail, status=exception.status_code, content_type='text/plain')
+        return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with the best coding the client accepts, out of
+    ``RESPONSE_COMPRESSION['ENCODINGS']`` (zstd and brotli need their optional
+    packages). Bodies under ``MIN_SIZE`` bytes are left alone, streaming
+    responses are compressed chunk by chunk, and the level can be set per
+    route prefix through ``ROUTES``.
+
+    Only routes under ``API_PATH_PREFIXES`` are compressed. Pages outside
+    them (``admin/``) carry CSRF tokens, and compressing a secret next to
+    attacker-influenced content exposes it to BREACH.
+    """
+
+    def get_levels(self, request):
+        config = settings.RESPONSE_COMPRESSION
+        levels = dict(config['LEVELS'])
+        matches = [prefix for prefix in config.get('ROUTES', {}) if request.path_info.startswith(prefix)]
+        if matches:
+            levels.update(config['ROUTES'][max(matches, key=len)])
+        return levels
+
+    def process_response(self, request, response):
+        if not is_api_request(request):
+            return response
+        config = settings.RESPONSE_COMPRESSION
+        if not response.streaming and len(response.content) < config['MIN_SIZE']:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        # Compressors buffer output, which would hold back server-sent events.
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), config['ENCODINGS'])
+        if encoding is None:
+            return response
+        codec = CODECS[encoding]
+        level = self.get_levels(request).get(encoding, codec.max_level)
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_sequence(codec, level, response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(codec, level, response.streaming_content)
+            # The compressed size is unknown until the stream is consumed.
+            del response.headers['Content-Length']
+        else:
+            compressed_content = codec.compress(response.content, level)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # A strong ETag identifies the exact bytes sent, so it must become weak
+        # once the body is re-encoded (RFC 9110 section 8.8.1); weak ETags still
+        # match conditional requests.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+
+        return response
+
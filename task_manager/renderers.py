@@ -0,0 +1,98 @@
+import re
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+LINE_SEPARATORS = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+# orjson writes floats the way repr() does, except those repr() puts in
+# exponent form: 1e16 vs 1e+16, 1.5e-7 vs 1.5e-07, 0.00001 vs 1e-05. Output
+# with none of these patterns needs no closer look; strings that happen to
+# match only cost a data walk. Both checks start with a literal byte, which
+# re can skip ahead to; a pattern starting with [0-9] scans byte by byte and
+# took longer than the encoding itself.
+EXPONENT = re.compile(rb'e[-0-9]')
+SMALL_FLOAT = b'.0000'
+
+
+def has_exponent_float(data):
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if 'e' in repr(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def default_encoder(obj):
+    # Types the fast encoders do not handle natively (Decimal, lazy strings,
+    # querysets, ...) and datetimes, which DRF formats with a trailing 'Z'.
+    return encoders.JSONEncoder().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Output is byte-for-byte what JSONRenderer produces for compact, unicode
+    JSON. Anything orjson cannot encode the same way (pretty-printing, ASCII
+    escaping, integers wider than 64 bits, floats in exponent form) falls
+    back to the stdlib encoder. The one difference: NaN and infinity, which
+    the stdlib encoder rejects, are written as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=default_encoder,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if (SMALL_FLOAT in ret or EXPONENT.search(ret)) and has_exponent_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders to MessagePack for internal services (``Accept: application/msgpack``).
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=default_encoder, use_bin_type=True)
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from rest_framework.utils.encoders import JSONEncoder
+
+from .compression import CODECS, negotiate_encoding
+
+
+SOURCE_PACKAGES = ('task_manager', 'users', 'tasks')
+
+
+def get_code_version():
+    """
+    Version the cached schema is tied to: ``SCHEMA_CACHE['CODE_VERSION']`` when
+    set (e.g. the deployed git SHA), otherwise a fingerprint of the project's
+    Python sources and spectacular settings.
+    """
+    version = settings.SCHEMA_CACHE.get('CODE_VERSION')
+    if version:
+        return version
+
+    digest = hashlib.sha256()
+    for package in SOURCE_PACKAGES:
+        for path in sorted((settings.BASE_DIR / package).rglob('*.py')):
+            digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+            digest.update(path.read_bytes())
+    digest.update(json.dumps(settings.SPECTACULAR_SETTINGS, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_artifact(path, version, schema):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'version': version, 'schema': schema}, f, cls=JSONEncoder)
+
+
+def read_artifact(path, version):
+    try:
+        with open(path) as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if artifact.get('version') != version:
+        return None
+    return artifact['schema']
+
+
+@dataclass
+class SchemaVariant:
+    content_type: str
+    body: bytes
+    etag: str
+    encoded: dict = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, content_type, body):
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        encoded = {name: codec.compress(body, codec.max_level) for name, codec in CODECS.items()}
+        return cls(content_type, body, etag, encoded)
+
+    def get_etag(self, coding=None):
+        # Each content coding is a different representation, so it needs its
+        # own strong ETag (RFC 9110 section 8.8.3).
+        return self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+
+
+class SchemaCache:
+    """
+    Holds the OpenAPI schema for the current code version, rendered once per
+    media type along with a copy pre-compressed with each available codec.
+    The schema is read from the ``build_schema`` artifact when it matches the
+    running code, and generated on first use otherwise.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._schema = None
+        self._variants = {}
+
+    def get_schema(self):
+        if self._schema is None:
+            with self._lock:
+                if self._schema is None:
+                    self._version = get_code_version()
+                    path = settings.SCHEMA_CACHE['ARTIFACT']
+                    schema = read_artifact(path, self._version) if path else None
+                    self._schema = schema if schema is not None else generate_schema()
+        return self._schema
+
+    def get_variant(self, renderer):
+        variant = self._variants.get(renderer.media_type)
+        if variant is None:
+            body = renderer.render(self.get_schema(), renderer.media_type, {})
+            if isinstance(body, str):
+                body = body.encode(renderer.charset or 'utf-8')
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            variant = self._variants.setdefault(renderer.media_type, SchemaVariant.build(content_type, body))
+        return variant
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._schema = None
+            self._variants = {}
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Serves the schema from ``schema_cache`` with an ETag and pre-compressed
+    bodies. Requests for a specific ``lang`` or ``version`` are rare and fall
+    back to live generation.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        variant = schema_cache.get_variant(request.accepted_renderer)
+        coding = negotiate_encoding(request.headers.get('Accept-Encoding', ''), settings.RESPONSE_COMPRESSION['ENCODINGS'])
+        etag = variant.get_etag(coding)
+        # If-None-Match uses the weak comparison: W/"x" matches "x".
+        if_none_match = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(variant.encoded[coding] if coding else variant.body, content_type=variant.content_type)
+            if coding:
+                response['Content-Encoding'] = coding
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -17,16 +19,30 @@ from datetime import timedelta
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Settings profile, selected with the DJANGO_ENV environment variable:
+# 'development' (default) or 'production'.
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+ENVIRONMENT = os.environ.get('DJANGO_ENV', 'development')
+PRODUCTION = ENVIRONMENT == 'production'
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-n9m4fu!##s0*r0rfx!u$cny@qmid3nbon!k*(gs$6+q$t*)gwo'
+if PRODUCTION:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+else:
+    SECRET_KEY = 'django-insecure-n9m4fu!##s0*r0rfx!u$cny@qmid3nbon!k*(gs$6+q$t*)gwo'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG also keeps every executed SQL query in memory for the whole request.
+DEBUG = not PRODUCTION
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
+
+if PRODUCTION:
+    # Served over HTTPS only: the admin session and CSRF cookies are never
+    # sent in clear text, and browsers are told to stay on HTTPS.
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+    SECURE_HSTS_SECONDS = int(os.environ.get('DJANGO_HSTS_SECONDS', 60 * 60 * 24 * 365))
 
 
 # Application definition
@@ -41,21 +57,58 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
-    'drf_spectacular',
+    'task_manager',
     'users',
     'tasks',
 ]
 
+# API schema and docs (api/schema/, api/docs/, api/redoc/). With
+# DJANGO_API_DOCS=0 neither the docs routes nor drf-spectacular's schema
+# generator are loaded by request-serving workers; only the light
+# drf_spectacular.utils decorators used on the views are imported.
+API_DOCS_ENABLED = os.environ.get('DJANGO_API_DOCS', '1') == '1'
+if API_DOCS_ENABLED:
+    INSTALLED_APPS.append('drf_spectacular')
+
+# Worker warmup (see task_manager/startup.py). When enabled, the WSGI/ASGI
+# entry points resolve the URLconf and build every view's serializer fields
+# before the worker serves its first request.
+STARTUP_WARMUP = os.environ.get('DJANGO_STARTUP_WARMUP') == '1'
+
+# Session, CSRF, auth and messages middleware are skipped for requests under
+# API_PATH_PREFIXES (JWT-only); admin/ keeps the full stack.
 MIDDLEWARE = [
+    'task_manager.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'task_manager.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'task_manager.middleware.CsrfViewMiddleware',
+    'task_manager.middleware.AuthenticationMiddleware',
+    'task_manager.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'task_manager.middleware.HashingPoolBusyMiddleware',
 ]
 
+API_PATH_PREFIXES = ['/api/']
+
+# security.W003 looks for django.middleware.csrf.CsrfViewMiddleware by exact
+# path. task_manager.middleware.CsrfViewMiddleware subclasses it and still
+# enforces CSRF everywhere outside API_PATH_PREFIXES, whose JWT-only requests
+# carry no cookies to forge.
+SILENCED_SYSTEM_CHECKS = ['security.W003']
+
+# Response compression (see task_manager/middleware.py). Codings are tried in
+# order; zstd and br are skipped unless zstandard/brotli are installed.
+RESPONSE_COMPRESSION = {
+    'ENCODINGS': ['zstd', 'br', 'gzip'],
+    'MIN_SIZE': 1024,
+    'LEVELS': {'zstd': 3, 'br': 4, 'gzip': 6},
+    # Per route prefix overrides, e.g. {'/api/tasks/': {'zstd': 6}}. On task
+    # pages (python -m benchmarks.compression) zstd 6 and br 5 save only a few
+    # percent over the defaults at 4-5x the CPU time, so none are set.
+    'ROUTES': {},
+}
+
 ROOT_URLCONF = 'task_manager.urls'
 
 TEMPLATES = [
@@ -75,6 +128,47 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
+ASGI_APPLICATION = 'task_manager.asgi.application'
+
+# Done tasks not updated for this many days are moved to the archive tables
+# by `python manage.py archive_tasks`.
+TASK_ARCHIVE_AFTER_DAYS = 90
+
+# Due date reminders, enqueued by `python manage.py schedule_reminders`.
+TASK_REMINDERS = {
+    'LEAD_TIME': timedelta(hours=24),
+    'BATCH_SIZE': 1000,
+}
+
+# Maximum number of IDs accepted by the task multi-get endpoint.
+TASK_BATCH_MAX_IDS = 100
+
+# Maximum number of comments per bulk create, and of task IDs in ?task__in=.
+COMMENT_BULK_MAX_ITEMS = 500
+COMMENT_FILTER_MAX_TASKS = 100
+
+# Per-view database budgets (see task_manager/budgets.py), keyed by a view's
+# query_budget_scope or '<scope>.<action>'. Requests running more than
+# MAX_QUERIES queries, or a statement longer than STATEMENT_TIMEOUT seconds,
+# are stopped with a 503. None disables a limit.
+QUERY_BUDGETS = {
+    'tasks': {'MAX_QUERIES': 20, 'STATEMENT_TIMEOUT': 2.0},
+    'comments': {'MAX_QUERIES': 20, 'STATEMENT_TIMEOUT': 2.0},
+    'users': {'MAX_QUERIES': 20, 'STATEMENT_TIMEOUT': 2.0},
+    # Inline offboarding runs one transaction per chunk of tasks.
+    'users.bulk_deactivate': {'MAX_QUERIES': None, 'STATEMENT_TIMEOUT': 30.0},
+}
+
+# Live task events (see tasks/events.py). Use 'tasks.events.RedisBackend' with
+# OPTIONS {'URL': ..., 'CHANNEL': ...} when running several ASGI workers.
+TASK_EVENTS = {
+    'BACKEND': 'tasks.events.InProcessBackend',
+    'OPTIONS': {},
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT_INTERVAL': 15,
+    'MAX_SUBSCRIBERS': 10000,
+}
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -83,9 +177,50 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60 if PRODUCTION else 0,
     }
 }
 
+# SQLite tuning for deployments that serve traffic from SQLite. WAL lets readers
+# run alongside the single writer; synchronous=NORMAL only fsyncs at checkpoints
+# (durable across application crashes, may lose the last commits on power loss);
+# BEGIN IMMEDIATE takes the write lock when a transaction starts, so concurrent
+# writers wait up to `timeout` seconds (SQLite's busy timeout) instead of failing
+# with "database is locked" when upgrading a read lock. Enabled in production
+# or with DJANGO_SQLITE_TUNED=1.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,  # KiB, per connection
+    'mmap_size': 256 * 2**20,
+    'temp_store': 'MEMORY',
+}
+SQLITE_OPTIONS = {
+    'init_command': '; '.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': 20,
+}
+if PRODUCTION or os.environ.get('DJANGO_SQLITE_TUNED') == '1':
+    DATABASES['default']['OPTIONS'] = SQLITE_OPTIONS
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Token revocation and query budget metrics need a cache shared by all workers
+# in production (see the users.W001 deploy check).
+if os.environ.get('DJANGO_REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['DJANGO_REDIS_URL'],
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -105,6 +240,41 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# The first hasher of the selected profile is used for new passwords; the
+# others stay listed so existing hashes still verify and are upgraded to the
+# preferred hasher the next time the user logs in. The argon2 profile needs
+# the optional argon2-cffi package.
+
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': [
+        'users.hashers.PBKDF2PasswordHasher',
+        'users.hashers.ScryptPasswordHasher',
+        'users.hashers.Argon2PasswordHasher',
+    ],
+    'scrypt': [
+        'users.hashers.ScryptPasswordHasher',
+        'users.hashers.PBKDF2PasswordHasher',
+        'users.hashers.Argon2PasswordHasher',
+    ],
+    'argon2': [
+        'users.hashers.Argon2PasswordHasher',
+        'users.hashers.ScryptPasswordHasher',
+        'users.hashers.PBKDF2PasswordHasher',
+    ],
+}
+
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[os.environ.get('PASSWORD_HASHER_PROFILE', 'pbkdf2')]
+
+PASSWORD_HASHING = {
+    'POOL_WORKERS': os.cpu_count() or 1,
+    'POOL_QUEUE': 32,
+    'POOL_TIMEOUT': 10,
+    'SCRYPT': {'WORK_FACTOR': 2**14, 'BLOCK_SIZE': 8, 'PARALLELISM': 1},
+    'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 19456, 'PARALLELISM': 1},
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -146,14 +316,64 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson is used when installed; output matches the stdlib JSONRenderer.
+    'DEFAULT_RENDERER_CLASSES': [
+        'task_manager.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'task_manager.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# application/msgpack content negotiation for internal services, enabled
+# when the optional msgpack package is installed.
+if importlib.util.find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('task_manager.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('task_manager.parsers.MessagePackParser')
+
+if not API_DOCS_ENABLED:
+    # extend_schema resolves the schema class when the views are decorated;
+    # DRF's own class is already imported, spectacular's AutoSchema pulls in
+    # the whole schema generator.
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'rest_framework.schemas.openapi.AutoSchema'
+
+if not PRODUCTION:
+    # The browsable API renders HTML templates; production clients only need JSON.
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('rest_framework.renderers.BrowsableAPIRenderer')
+
 # Simple JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'AUTH_TOKEN_CLASSES': ('users.tokens.RevocableAccessToken',),
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.CustomTokenRefreshSerializer',
+}
+
+# Token revocation (see users/revocation.py)
+# Rotated refresh tokens and soft-deleted users are revoked through the cache
+# instead of the database-backed token_blacklist app.
+TOKEN_REVOCATION = {
+    'CACHE_ALIAS': 'default',
+    'BLOOM_CAPACITY': 100000,
+    'BLOOM_ERROR_RATE': 0.001,
+    'SYNC_INTERVAL': 5,
+}
+
+# Bulk user deactivation (see users/offboarding.py). Jobs reassigning at most
+# INLINE_MAX_TASKS open tasks run in the request; larger ones run in a
+# background thread, or with BACKGROUND = 'command' are left for
+# `python manage.py run_offboarding_jobs`. A running job that has not reported
+# progress for STALE_AFTER seconds may be claimed again.
+USER_OFFBOARDING = {
+    'CHUNK_SIZE': 500,
+    'INLINE_MAX_TASKS': 1000,
+    'MAX_USERS': 1000,
+    'BACKGROUND': 'thread',
+    'STALE_AFTER': 600,
 }
 
 # Spectacular settings
@@ -164,4 +384,16 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
     'COMPONENT_SPLIT_REQUEST': True,
     'SCHEMA_PATH_PREFIX': '/api/',
+    'ENUM_NAME_OVERRIDES': {
+        'StatusEnum': 'tasks.models.Task.Status',
+        'OffboardingJobStatusEnum': 'users.models.OffboardingJob.Status',
+    },
+}
+
+# Precomputed OpenAPI schema (see task_manager/schema.py)
+# Run `python manage.py build_schema` at build time to write the artifact; it
+# is only used while CODE_VERSION (or the source fingerprint) matches.
+SCHEMA_CACHE = {
+    'ARTIFACT': BASE_DIR / 'build' / 'openapi.json',
+    'CODE_VERSION': os.environ.get('APP_VERSION'),
 }
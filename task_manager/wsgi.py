@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402  (needs settings configured)
+
+if settings.STARTUP_WARMUP:
+    # Runs once per worker before it accepts requests, or once in the master
+    # with gunicorn --preload.
+    from task_manager.startup import warm_up
+
+    warm_up()
@@ -0,0 +1,106 @@
+from django.db import connection
+from django.utils import timezone
+
+from .models import TaskStatusChange
+
+PERCENTILES = (50, 90, 95)
+
+DURATION_SQL = {
+    'sqlite': '(julianday({end}) - julianday({start})) * 86400.0',
+    'postgresql': 'EXTRACT(EPOCH FROM ({end} - {start}))',
+}
+
+PERIOD_SQL = {
+    'sqlite': {
+        'day': "strftime('%%Y-%%m-%%d', {column})",
+        # ISO 8601 week, as IYYY-"W"IW on PostgreSQL: the week belongs to the
+        # year of its Thursday and is numbered from that year's first Thursday.
+        # (strftime has %G/%V only from SQLite 3.46.)
+        'week': "strftime('%%Y-W', date({column}, '-3 days', 'weekday 4')) || "
+                "printf('%%02d', (strftime('%%j', date({column}, '-3 days', 'weekday 4')) - 1) / 7 + 1)",
+        'month': "strftime('%%Y-%%m', {column})",
+    },
+    'postgresql': {
+        'day': "to_char({column}, 'YYYY-MM-DD')",
+        'week': "to_char({column}, 'IYYY-\"W\"IW')",
+        'month': "to_char({column}, 'YYYY-MM')",
+    },
+}
+
+TIME_IN_STATUS_SQL = """
+WITH spans AS (
+    SELECT assignee_id AS user_id,
+           to_status AS status,
+           changed_at AS started_at,
+           LEAD(changed_at) OVER (PARTITION BY task_id ORDER BY changed_at, id) AS ended_at
+    FROM {table}
+    WHERE task_id IN (SELECT task_id FROM {table} WHERE changed_at >= %s AND changed_at < %s)
+),
+durations AS (
+    SELECT user_id, status, {period} AS period, {duration} AS seconds
+    FROM spans
+    WHERE started_at >= %s AND started_at < %s
+      AND (ended_at IS NOT NULL OR status != {done})
+      {user_filter}
+),
+ranked AS (
+    SELECT user_id, status, period, seconds,
+           ROW_NUMBER() OVER (PARTITION BY user_id, status, period ORDER BY seconds) AS row_rank,
+           COUNT(*) OVER (PARTITION BY user_id, status, period) AS total
+    FROM durations
+)
+SELECT user_id, status, period, COUNT(*), AVG(seconds), {percentiles}
+FROM ranked
+GROUP BY user_id, status, period
+ORDER BY user_id, period, status
+"""
+
+
+def time_in_status(start, end, interval=None, user_id=None):
+    """
+    Time-in-status statistics for status spans that started in [start, end),
+    grouped by assignee, status and (optionally) day/week/month.
+
+    A span runs from a status change to the next change of the same task;
+    spans still open count up to now, except Done, which has no end. The
+    whole computation (span durations, nearest-rank percentiles) runs in the
+    database.
+    """
+    vendor = connection.vendor
+    if vendor not in DURATION_SQL:
+        raise NotImplementedError(f'Time-in-status analytics are not supported on {vendor}.')
+
+    ops = connection.ops
+    now = ops.adapt_datetimefield_value(timezone.now())
+    start = ops.adapt_datetimefield_value(start)
+    end = ops.adapt_datetimefield_value(end)
+
+    sql = TIME_IN_STATUS_SQL.format(
+        table=ops.quote_name(TaskStatusChange._meta.db_table),
+        period=PERIOD_SQL[vendor][interval].format(column='started_at') if interval else "'all'",
+        duration=DURATION_SQL[vendor].format(end='COALESCE(ended_at, %s)', start='started_at'),
+        done=TaskStatusChange.StatusCode.DONE.value,
+        user_filter='AND user_id = %s' if user_id is not None else '',
+        percentiles=', '.join(
+            f'MIN(CASE WHEN row_rank >= {p / 100} * total THEN seconds END)' for p in PERCENTILES
+        ),
+    )
+    params = [start, end, now, start, end]
+    if user_id is not None:
+        params.append(user_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'user_id': row_user_id,
+            'status': TaskStatusChange.status_for(status),
+            'period': period,
+            'count': count,
+            'avg_seconds': average,
+            **{f'p{p}_seconds': value for p, value in zip(PERCENTILES, percentiles)},
+        }
+        for row_user_id, status, period, count, average, *percentiles in rows
+    ]
@@ -0,0 +1,111 @@
+from django.db import connection, transaction
+from django.db.models import Value
+from django.http import Http404
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import ArchivedComment, ArchivedTask, Comment, Task, TaskReminder
+
+TASK_FIELDS = ('id', 'title', 'description', 'status', 'assigned_to_id', 'due_at', 'created_at', 'updated_at')
+COMMENT_FIELDS = ('id', 'task_id', 'author_id', 'content', 'created_at')
+
+
+def delete_rows(model, field_name, values):
+    """
+    ``DELETE FROM <table> WHERE <field> IN (values)``, without collecting
+    related objects or sending delete signals.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.get_field(field_name).column)
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', list(values))
+
+
+def archive_done_tasks(before, batch_size=500):
+    """
+    Move Done tasks last updated before ``before``, and their comments, into
+    the archive tables. Each batch is copied and deleted in its own
+    transaction; yields the number of tasks archived per batch.
+    """
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Task.objects.select_for_update()
+                .filter(status=Task.Status.DONE, updated_at__lt=before)
+                .order_by()
+                .values(*TASK_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return
+            task_ids = [row['id'] for row in rows]
+            archived_at = timezone.now()
+
+            ArchivedTask.objects.bulk_create(ArchivedTask(archived_at=archived_at, **row) for row in rows)
+            ArchivedComment.objects.bulk_create(
+                ArchivedComment(**row)
+                for row in Comment.objects.filter(task_id__in=task_ids).order_by().values(*COMMENT_FIELDS).iterator()
+            )
+            # Plain SQL deletes: archiving must not send post_delete (which
+            # would publish task.deleted events) or load every row into Python.
+            delete_rows(TaskReminder, 'task', task_ids)
+            delete_rows(Comment, 'task', task_ids)
+            delete_rows(Task, 'id', task_ids)
+        yield len(task_ids)
+
+
+def include_archived(request):
+    return request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+class IncludeArchivedMixin:
+    """
+    Adds ``?include_archived=true`` to a viewset's list and retrieve actions.
+
+    Lists page over the union of the hot and archive tables: only the
+    (id, created_at) keys go through the UNION, then the rows for the
+    current page are loaded from each table. ``get_archived_queryset`` must
+    apply the same visibility rules as ``get_queryset``.
+    """
+
+    def get_archived_queryset(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not include_archived(request):
+            return super().list(request, *args, **kwargs)
+
+        def keys(queryset, archived):
+            return (
+                self.filter_queryset(queryset)
+                .order_by()
+                .annotate(archived=Value(archived))
+                .values_list('id', 'created_at', 'archived')
+            )
+
+        union = keys(self.get_queryset(), False).union(keys(self.get_archived_queryset(), True), all=True)
+        union = union.order_by('-created_at', '-id')
+        page = self.paginate_queryset(union)
+        if page is None:
+            return Response(self.get_serializer(self.load_rows(list(union)), many=True).data)
+        return self.get_paginated_response(self.get_serializer(self.load_rows(page), many=True).data)
+
+    def load_rows(self, keys):
+        hot_ids = [pk for pk, _, archived in keys if not archived]
+        archived_ids = [pk for pk, _, archived in keys if archived]
+        hot = self.get_queryset().in_bulk(hot_ids)
+        archived = self.get_archived_queryset().in_bulk(archived_ids)
+        return [(archived if is_archived else hot)[pk] for pk, _, is_archived in keys]
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != 'retrieve' or not include_archived(self.request):
+                raise
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = self.get_archived_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).first()
+        if obj is None:
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULTS = {
+    'BACKEND': 'tasks.events.InProcessBackend',
+    'OPTIONS': {},
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT_INTERVAL': 15,
+    'MAX_SUBSCRIBERS': 10000,
+}
+
+
+def get_events_setting(name):
+    return getattr(settings, 'TASK_EVENTS', {}).get(name, DEFAULTS[name])
+
+
+def task_event(event_type, task, previous_assignee_id=None):
+    recipients = {task.assigned_to_id}
+    if previous_assignee_id is not None:
+        recipients.add(previous_assignee_id)
+    return {
+        'type': event_type,
+        'recipients': sorted(recipients),
+        'data': {
+            'task_id': task.pk,
+            'title': task.title,
+            'status': task.status,
+            'assigned_to_id': task.assigned_to_id,
+            'updated_at': task.updated_at.isoformat() if task.updated_at else None,
+        },
+    }
+
+
+def comment_event(event_type, comment, assignee_id):
+    return {
+        'type': event_type,
+        'recipients': [assignee_id],
+        'data': {
+            'comment_id': comment.pk,
+            'task_id': comment.task_id,
+            'author_id': comment.author_id,
+            'created_at': comment.created_at.isoformat(),
+        },
+    }
+
+
+def reminder_event(reminder, assignee_id):
+    return {
+        'type': f'task.{reminder.kind}',
+        'recipients': [assignee_id],
+        'data': {
+            'task_id': reminder.task_id,
+            'due_at': reminder.due_at.isoformat(),
+        },
+    }
+
+
+class Subscription:
+    """
+    One connected client. Events are buffered in a bounded queue; when the
+    client falls ``QUEUE_SIZE`` events behind, the backlog is dropped and
+    replaced by a single ``resync`` event telling it to refetch, so a slow
+    consumer costs a fixed amount of memory and never blocks publishers.
+    """
+
+    def __init__(self, user_id, is_admin, queue_size):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+
+    def wants(self, event):
+        return self.is_admin or self.user_id in event['recipients']
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'type': 'resync', 'id': event['id'], 'data': {}})
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class BrokerFull(Exception):
+    pass
+
+
+class Broker:
+    """
+    In-process fan-out of task events to the subscriptions of this process.
+
+    ``dispatch`` may be called from any thread (model signals run in the sync
+    worker threads); delivery is scheduled onto each subscriber's event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._sequence = 0
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    backend_class = import_string(get_events_setting('BACKEND'))
+                    self._backend = backend_class(self, **get_events_setting('OPTIONS'))
+        return self._backend
+
+    def subscriber_count(self):
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def has_capacity(self):
+        return self.subscriber_count() < get_events_setting('MAX_SUBSCRIBERS')
+
+    def subscribe(self, user):
+        if not self.has_capacity():
+            raise BrokerFull()
+        subscription = Subscription(user.pk, user.role == 'Admin', get_events_setting('QUEUE_SIZE'))
+        self.backend.start(subscription.loop)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.loop, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.loop)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.loop]
+
+    def publish(self, event):
+        self.backend.publish(event)
+
+    def dispatch(self, event):
+        with self._lock:
+            self._sequence += 1
+            event = dict(event, id=self._sequence)
+            loops = list(self._subscriptions)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._deliver, loop, event)
+            except RuntimeError:
+                # The loop was closed without its subscriptions unsubscribing.
+                with self._lock:
+                    self._subscriptions.pop(loop, None)
+
+    def _deliver(self, loop, event):
+        for subscription in list(self._subscriptions.get(loop, ())):
+            if subscription.wants(event):
+                subscription.offer(event)
+
+
+class InProcessBackend:
+    """
+    Delivers events only to subscribers in the publishing process. Suitable
+    for a single ASGI worker.
+    """
+
+    def __init__(self, broker, **options):
+        self.broker = broker
+
+    def start(self, loop):
+        pass
+
+    def publish(self, event):
+        self.broker.dispatch(event)
+
+
+class RedisBackend:
+    """
+    Fans events out across worker processes through Redis pub/sub (needs the
+    optional ``redis`` package). Every process, including the publisher,
+    receives events through its subscription to ``CHANNEL``.
+    """
+
+    def __init__(self, broker, URL='redis://localhost:6379/0', CHANNEL='task-events'):
+        import redis
+
+        self.broker = broker
+        self.url = URL
+        self.channel = CHANNEL
+        self._client = redis.Redis.from_url(URL)
+        self._listeners = {}
+
+    def start(self, loop):
+        if loop not in self._listeners:
+            self._listeners[loop] = loop.create_task(self._listen())
+
+    async def _listen(self):
+        import redis.asyncio
+
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message['type'] == 'message':
+                            self.broker.dispatch(json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Task event listener lost its Redis connection; reconnecting')
+                await asyncio.sleep(1)
+
+    def publish(self, event):
+        self._client.publish(self.channel, json.dumps(event))
+
+
+broker = Broker()
@@ -0,0 +1,58 @@
+import django_filters
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .models import OPEN_STATUSES, Task
+
+
+class LimitedCSVField(django_filters.fields.BaseCSVField):
+    def __init__(self, *args, max_items=None, **kwargs):
+        self.max_items = max_items
+        super().__init__(*args, **kwargs)
+
+    def clean(self, value):
+        value = super().clean(value)
+        if self.max_items is not None and value and len(value) > self.max_items:
+            raise ValidationError(f'At most {self.max_items} values are allowed.', code='max_items')
+        return value
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    base_field_class = LimitedCSVField
+
+
+class CommentFilter(django_filters.FilterSet):
+    # Declared without Meta.model so the same filterset also applies to
+    # ArchivedComment querysets (?include_archived=true); a model choice filter
+    # would reject IDs of tasks that have been archived.
+    task = django_filters.NumberFilter(field_name='task_id', help_text='Filter by task ID')
+    task__in = NumberInFilter(field_name='task_id', lookup_expr='in',
+                              max_items=settings.COMMENT_FILTER_MAX_TASKS,
+                              help_text='Comma-separated task IDs')
+    per_task = django_filters.NumberFilter(method='limit_per_task', min_value=1,
+                                           help_text='Only the latest N comments of each task')
+
+    def limit_per_task(self, queryset, name, value):
+        return queryset.alias(
+            task_rank=Window(RowNumber(), partition_by=F('task_id'), order_by=[F('created_at').desc(), F('id').desc()])
+        ).filter(task_rank__lte=value)
+
+
+class TaskFilter(django_filters.FilterSet):
+    # No Meta.model, for the same reason as CommentFilter: it also filters
+    # ArchivedTask querysets.
+    status = django_filters.ChoiceFilter(choices=Task.Status.choices, help_text='Filter by task status')
+    assigned_to = django_filters.NumberFilter(field_name='assigned_to_id', help_text='Filter by assigned user ID')
+    due_before = django_filters.IsoDateTimeFilter(field_name='due_at', lookup_expr='lt',
+                                                  help_text='Only tasks due before this time')
+    due_after = django_filters.IsoDateTimeFilter(field_name='due_at', lookup_expr='gte',
+                                                 help_text='Only tasks due at or after this time')
+    overdue = django_filters.BooleanFilter(method='filter_overdue',
+                                           help_text='Only open tasks past their due date (true) or the rest (false)')
+
+    def filter_overdue(self, queryset, name, value):
+        overdue = Q(status__in=OPEN_STATUSES, due_at__lt=timezone.now())
+        return queryset.filter(overdue) if value else queryset.exclude(overdue)
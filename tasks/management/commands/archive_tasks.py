@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.archive import archive_done_tasks
+
+
+class Command(BaseCommand):
+    help = 'Move Done tasks not updated for a while, and their comments, into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS,
+                            help='Archive Done tasks not updated for this many days')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Tasks moved per transaction')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        total = 0
+        for archived in archive_done_tasks(before, options['batch_size']):
+            total += archived
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Archived {total} tasks so far...')
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} Done tasks last updated before {before:%Y-%m-%d %H:%M}.'))
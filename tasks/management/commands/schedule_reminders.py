@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tasks.reminders import schedule_reminders
+
+
+class Command(BaseCommand):
+    help = 'Enqueue reminders for tasks that are due soon or overdue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running, one tick every this many seconds (default: run once)')
+        parser.add_argument('--since', type=parse_datetime,
+                            help='Scan due dates from this ISO 8601 time instead of the previous tick '
+                                 '(first tick only, e.g. to backfill)')
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since is not None and timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        while True:
+            enqueued = schedule_reminders(since=since)
+            since = None
+            self.stdout.write(
+                f"Enqueued {enqueued['upcoming']} upcoming and {enqueued['overdue']} overdue reminders."
+            )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:16
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_archivedcomment_archivedtask_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('from_status', models.PositiveSmallIntegerField(choices=[(1, 'ToDo'), (2, 'InProgress'), (3, 'Done')], null=True)),
+                ('to_status', models.PositiveSmallIntegerField(choices=[(1, 'ToDo'), (2, 'InProgress'), (3, 'Done')])),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assignee', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('changed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['changed_at'],
+                'indexes': [models.Index(fields=['task_id', 'changed_at'], name='status_change_task_idx'), models.Index(fields=['changed_at'], name='status_change_time_idx')],
+            },
+        ),
+    ]
@@ -23,14 +23,38 @@ class Task(models.Model):
         on_delete=models.PROTECT,
         related_name='assigned_tasks'
     )
+    due_at = models.DateTimeField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.title} ({self.assigned_to.email})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so signal handlers can tell what changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+
+    def get_loaded_value(self, field_name):
+        return getattr(self, '_loaded_values', {}).get(field_name)
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Lets archive_tasks find old Done tasks without a full scan.
+            models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+            # ?overdue=true: open statuses, then a due_at range.
+            models.Index(fields=['status', 'due_at'], name='task_status_due_idx'),
+        ]
+
+
+OPEN_STATUSES = [Task.Status.TODO, Task.Status.IN_PROGRESS]
 
 
 class Comment(models.Model):
@@ -51,4 +75,150 @@ class Comment(models.Model):
         return f"Comment by {self.author.email} on {self.task.title}"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+
+
+class ArchivedTask(models.Model):
+    """
+    Done task moved out of the hot ``Task`` table by ``archive_tasks``. Keeps the
+    original primary key so archived tasks stay addressable by ID.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    assigned_to = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='archived_tasks'
+    )
+    due_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.title} ({self.assigned_to.email}, archived)"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ArchivedComment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(
+        ArchivedTask,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments'
+    )
+    content = models.TextField()
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Archived comment by {self.author.email} on {self.task.title}"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class TaskStatusChange(models.Model):
+    """
+    Append-only log of task status transitions, used for cycle-time analytics.
+
+    Statuses are stored as small integers and ``task_id`` is a plain column
+    rather than a foreign key, so the history survives tasks being archived
+    or deleted. ``assignee`` is the task's assignee at the time of the change.
+    """
+    class StatusCode(models.IntegerChoices):
+        TODO = 1, 'ToDo'
+        IN_PROGRESS = 2, 'InProgress'
+        DONE = 3, 'Done'
+
+    task_id = models.BigIntegerField()
+    assignee = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    from_status = models.PositiveSmallIntegerField(choices=StatusCode.choices, null=True)
+    to_status = models.PositiveSmallIntegerField(choices=StatusCode.choices)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def code_for(cls, status):
+        return None if status is None else cls.StatusCode[Task.Status(status).name].value
+
+    @classmethod
+    def status_for(cls, code):
+        return Task.Status[cls.StatusCode(code).name].value
+
+    @classmethod
+    def record(cls, task, from_status, changed_by=None):
+        return cls.objects.create(
+            task_id=task.pk,
+            assignee_id=task.assigned_to_id,
+            changed_by=changed_by,
+            from_status=cls.code_for(from_status),
+            to_status=cls.code_for(task.status),
+        )
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('TaskStatusChange rows are append-only.')
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Task {self.task_id}: {self.from_status} -> {self.to_status} at {self.changed_at}"
+
+    class Meta:
+        ordering = ['changed_at']
+        indexes = [
+            models.Index(fields=['task_id', 'changed_at'], name='status_change_task_idx'),
+            models.Index(fields=['changed_at'], name='status_change_time_idx'),
+        ]
+
+
+class TaskReminder(models.Model):
+    """
+    Reminder enqueued by ``schedule_reminders``. Unique per task, kind and due
+    date, so re-running a scheduler tick never enqueues a reminder twice,
+    while moving a task's due date makes it eligible again.
+    """
+    class Kind(models.TextChoices):
+        UPCOMING = 'upcoming', 'Upcoming'
+        OVERDUE = 'overdue', 'Overdue'
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='reminders'
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    due_at = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} reminder for task {self.task_id}"
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'kind', 'due_at'], name='unique_task_reminder'),
+        ]
+
+
+class ReminderSchedule(models.Model):
+    """Single row holding how far ``schedule_reminders`` has scanned."""
+    scanned_until = models.DateTimeField()
@@ -0,0 +1,8 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class CommentPagination(PageNumberPagination):
+    # Lets ?task__in=...&per_task=N fetch the comments of a whole page of
+    # tasks in one request.
+    page_size_query_param = 'page_size'
+    max_page_size = 500
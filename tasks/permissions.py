@@ -38,7 +38,8 @@ class CanCommentOnOwnTasks(permissions.BasePermission):
         if request.user.role == 'Admin':
             return True
         
-        if request.method == 'POST':
+        # The bulk action checks all of its tasks itself.
+        if request.method == 'POST' and getattr(view, 'action', None) == 'create':
             task_id = request.data.get('task')
             if task_id:
                 from .models import Task
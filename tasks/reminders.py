@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .events import broker, reminder_event
+from .models import OPEN_STATUSES, ReminderSchedule, Task, TaskReminder
+
+DEFAULTS = {
+    'LEAD_TIME': timedelta(hours=24),
+    'BATCH_SIZE': 1000,
+}
+
+
+def get_reminder_setting(name):
+    return getattr(settings, 'TASK_REMINDERS', {}).get(name, DEFAULTS[name])
+
+
+def schedule_reminders(now=None, since=None):
+    """
+    One scheduler tick. Enqueues an ``overdue`` reminder for each open task
+    whose due date passed since the previous tick, and an ``upcoming`` one for
+    each open task due within ``LEAD_TIME``.
+
+    Both come from one query, an index range scan of (status, due_at) over
+    (previous tick, now + LEAD_TIME], so the cost of a tick depends on the
+    tasks due around now, not on the total number of open tasks. Due dates
+    set in the past between two ticks are not reminded. Returns the number of
+    reminders enqueued per kind.
+    """
+    now = now or timezone.now()
+    lead_time = get_reminder_setting('LEAD_TIME')
+    batch_size = get_reminder_setting('BATCH_SIZE')
+    enqueued = {kind.value: 0 for kind in TaskReminder.Kind}
+
+    with transaction.atomic():
+        schedule = ReminderSchedule.objects.select_for_update().first()
+        if since is None:
+            since = schedule.scanned_until if schedule else now
+
+        window = (
+            Task.objects.filter(due_at__gt=since, due_at__lte=now + lead_time, status__in=OPEN_STATUSES)
+            .order_by('due_at')
+            .values_list('id', 'assigned_to_id', 'due_at')
+        )
+        # The window only spans the tasks due around now, so it fits in memory.
+        rows = list(window)
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            existing = set(
+                TaskReminder.objects.filter(task_id__in=[task_id for task_id, _, _ in batch])
+                .values_list('task_id', 'kind', 'due_at')
+            )
+            reminders = []
+            for task_id, assignee_id, due_at in batch:
+                kind = TaskReminder.Kind.OVERDUE if due_at <= now else TaskReminder.Kind.UPCOMING
+                if (task_id, kind, due_at) not in existing:
+                    reminders.append((TaskReminder(task_id=task_id, kind=kind, due_at=due_at, created_at=now), assignee_id))
+            # ignore_conflicts covers a concurrent scheduler racing this one.
+            TaskReminder.objects.bulk_create([reminder for reminder, _ in reminders], ignore_conflicts=True)
+            for reminder, assignee_id in reminders:
+                enqueued[reminder.kind] += 1
+                transaction.on_commit(lambda event=reminder_event(reminder, assignee_id): broker.publish(event))
+
+        if schedule is None:
+            ReminderSchedule.objects.create(scanned_until=now)
+        else:
+            schedule.scanned_until = max(schedule.scanned_until, now)
+            schedule.save(update_fields=['scanned_until'])
+    return enqueued
@@ -1,6 +1,11 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_field
-from .models import Task, Comment
+from .models import Task, Comment, TaskStatusChange
 from users.serializers import UserSerializer
 
 
@@ -21,6 +26,21 @@ class CommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class BulkCommentItemSerializer(serializers.Serializer):
+    task = serializers.IntegerField(help_text="ID of the task this comment belongs to")
+    content = serializers.CharField(help_text="Comment content")
+
+
+class BulkCommentSerializer(serializers.Serializer):
+    comments = BulkCommentItemSerializer(many=True, allow_empty=False)
+
+    def validate_comments(self, value):
+        max_items = getattr(settings, 'COMMENT_BULK_MAX_ITEMS', 500)
+        if len(value) > max_items:
+            raise serializers.ValidationError(f"At most {max_items} comments can be created at once.")
+        return value
+
+
 class TaskSerializer(serializers.ModelSerializer):
     assigned_to = UserSerializer(read_only=True)
     assigned_to_id = serializers.IntegerField(
@@ -34,15 +54,101 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = (
             'id', 'title', 'description', 'status', 'assigned_to', 
-            'assigned_to_id', 'created_at', 'updated_at', 'comments', 'comments_count'
+            'assigned_to_id', 'due_at', 'created_at', 'updated_at', 'comments', 'comments_count'
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
         extra_kwargs = {
             'title': {'help_text': 'Task title'},
             'description': {'help_text': 'Detailed description of the task'},
-            'status': {'help_text': 'Current status: ToDo, InProgress, or Done'}
+            'status': {'help_text': 'Current status: ToDo, InProgress, or Done'},
+            'due_at': {'help_text': 'Optional deadline; reminders are sent before and after it'}
         }
 
     @extend_schema_field(serializers.IntegerField)
     def get_comments_count(self, obj):
-        return obj.comments.count()
\ No newline at end of file
+        return obj.comments.count()
+
+    def _changed_by(self):
+        request = self.context.get('request')
+        return request.user if request is not None else None
+
+    @transaction.atomic
+    def create(self, validated_data):
+        task = super().create(validated_data)
+        TaskStatusChange.record(task, None, self._changed_by())
+        return task
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        previous_status = instance.status
+        task = super().update(instance, validated_data)
+        if task.status != previous_status:
+            TaskStatusChange.record(task, previous_status, self._changed_by())
+        return task
+
+
+class TaskIdListField(serializers.ListField):
+    """List of task IDs, given as a JSON array or as ``?ids=1,2,3``."""
+
+    child = serializers.IntegerField(min_value=1)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        if isinstance(data, list):
+            data = [
+                part
+                for item in data
+                for part in (item.replace(' ', '').split(',') if isinstance(item, str) else [item])
+                if part != ''
+            ]
+        return super().to_internal_value(data)
+
+
+class TaskBatchQuerySerializer(serializers.Serializer):
+    ids = TaskIdListField(
+        allow_empty=False,
+        help_text="Task IDs to fetch, at most TASK_BATCH_MAX_IDS (default 100)"
+    )
+
+    def validate_ids(self, value):
+        ids = list(dict.fromkeys(value))
+        max_ids = getattr(settings, 'TASK_BATCH_MAX_IDS', 100)
+        if len(ids) > max_ids:
+            raise serializers.ValidationError(f"At most {max_ids} task IDs can be fetched at once.")
+        return ids
+
+
+class TaskBatchSerializer(serializers.Serializer):
+    results = TaskSerializer(many=True, help_text="Tasks found and visible to you, in request order")
+    forbidden = serializers.ListField(child=serializers.IntegerField(), help_text="IDs of tasks you cannot access")
+    missing = serializers.ListField(child=serializers.IntegerField(), help_text="IDs that do not exist")
+
+
+class StatusAnalyticsQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False, help_text="Start of the period (default: 30 days ago)")
+    end = serializers.DateTimeField(required=False, help_text="End of the period (default: now)")
+    interval = serializers.ChoiceField(
+        choices=['day', 'week', 'month'],
+        required=False,
+        help_text="Split the period into day, week or month buckets"
+    )
+    user = serializers.IntegerField(required=False, help_text="Only include tasks assigned to this user (Admin only)")
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.now())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=30))
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError("start must be before end")
+        return attrs
+
+
+class StatusAnalyticsSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(allow_null=True)
+    status = serializers.ChoiceField(choices=Task.Status.choices)
+    period = serializers.CharField(help_text="Bucket label, or 'all' without an interval")
+    count = serializers.IntegerField(help_text="Number of status spans")
+    avg_seconds = serializers.FloatField()
+    p50_seconds = serializers.FloatField()
+    p90_seconds = serializers.FloatField()
+    p95_seconds = serializers.FloatField()
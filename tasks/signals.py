@@ -0,0 +1,31 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .events import broker, comment_event, task_event
+from .models import Comment, Task
+
+
+def publish_on_commit(event):
+    transaction.on_commit(partial(broker.publish, event))
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, **kwargs):
+    previous_assignee_id = None if created else instance.get_loaded_value('assigned_to_id')
+    if previous_assignee_id == instance.assigned_to_id:
+        previous_assignee_id = None
+    publish_on_commit(task_event('task.created' if created else 'task.updated', instance, previous_assignee_id))
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    publish_on_commit(task_event('task.deleted', instance))
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_saved(sender, instance, created, **kwargs):
+    assignee_id = instance.task.assigned_to_id
+    publish_on_commit(comment_event('comment.created' if created else 'comment.updated', instance, assignee_id))
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .events import BrokerFull, broker, get_events_setting
+
+
+def authenticate_token(raw_token):
+    """
+    Return ``(user, token)`` for a valid access token, or ``(None, None)``.
+    """
+    if not raw_token:
+        return None, None
+    close_old_connections()
+    try:
+        authentication = JWTAuthentication()
+        token = authentication.get_validated_token(raw_token.encode())
+        user = authentication.get_user(token)
+    except (InvalidToken, AuthenticationFailed):
+        return None, None
+    finally:
+        close_old_connections()
+    return (user, token) if user.is_active else (None, None)
+
+
+def token_is_valid(token):
+    # Streams outlive a request, so the token is re-checked on every
+    # heartbeat. Soft-deleting a user revokes their tokens, which covers
+    # is_active without a database query.
+    try:
+        token.check_exp(current_time=aware_utcnow())
+        token.check_revoked()
+    except TokenError:
+        return False
+    return True
+
+
+def next_check_in(token, heartbeat):
+    return max(0, min(heartbeat, token['exp'] - time.time()))
+
+
+def get_request_token(request):
+    # Browsers' EventSource cannot set headers, so the token may also be passed
+    # as ?token=.
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Bearer '):
+        return header[len('Bearer '):]
+    return request.GET.get('token')
+
+
+def format_sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n".encode()
+
+
+async def sse_stream(user, token):
+    try:
+        subscription = broker.subscribe(user)
+    except BrokerFull:
+        yield b'event: unavailable\ndata: {}\n\n'
+        return
+    heartbeat = get_events_setting('HEARTBEAT_INTERVAL')
+    try:
+        yield b'retry: 5000\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), next_check_in(token, heartbeat))
+            except asyncio.TimeoutError:
+                if not token_is_valid(token):
+                    yield b'event: unauthorized\ndata: {}\n\n'
+                    return
+                yield b': keepalive\n\n'
+                continue
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def task_event_stream(request):
+    """
+    Server-Sent Events stream of changes to the tasks visible to the user
+    (assigned tasks; all tasks for admins). The stream ends when the access
+    token expires or is revoked. Requires an ASGI server.
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI consumes an async streaming body in full before sending it,
+        # which for an endless stream ties up the worker forever.
+        return JsonResponse({'detail': 'Event streams are only served by the ASGI application.'}, status=501)
+    user, token = await sync_to_async(authenticate_token)(get_request_token(request))
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+    if not broker.has_capacity():
+        return JsonResponse({'detail': 'Too many open event streams, retry later.'}, status=503)
+
+    response = StreamingHttpResponse(sse_stream(user, token), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def task_event_websocket(scope, receive, send):
+    """
+    WebSocket variant of ``task_event_stream`` served directly from the ASGI
+    application. Authenticate with ``?token=<access token>``; each event is
+    sent as a JSON text frame.
+    """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    query = parse_qs(scope.get('query_string', b'').decode())
+    user, token = await sync_to_async(authenticate_token)(query.get('token', [None])[0])
+    if user is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    try:
+        subscription = broker.subscribe(user)
+    except BrokerFull:
+        await send({'type': 'websocket.close', 'code': 1013})
+        return
+
+    await send({'type': 'websocket.accept'})
+    heartbeat = get_events_setting('HEARTBEAT_INTERVAL')
+    receiver = asyncio.ensure_future(receive())
+    try:
+        while True:
+            getter = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({receiver, getter}, timeout=next_check_in(token, heartbeat),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                getter.cancel()
+                if not token_is_valid(token):
+                    await send({'type': 'websocket.close', 'code': 4401})
+                    break
+                continue
+            if getter in done:
+                event = getter.result()
+                await send({'type': 'websocket.send', 'text': json.dumps({'id': event['id'], 'type': event['type'], 'data': event['data']})})
+            else:
+                getter.cancel()
+            if receiver in done:
+                if receiver.result()['type'] == 'websocket.disconnect':
+                    break
+                # Client messages are ignored.
+                receiver = asyncio.ensure_future(receive())
+    finally:
+        receiver.cancel()
+        broker.unsubscribe(subscription)
@@ -1,11 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import TaskViewSet, CommentViewSet
+from .streams import task_event_stream
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet)
 router.register(r'comments', CommentViewSet)
 
 urlpatterns = [
+    # Must come before the router so 'events' is not taken as a task pk.
+    path('tasks/events/', task_event_stream, name='task-events'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
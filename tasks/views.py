@@ -1,11 +1,23 @@
-from rest_framework import viewsets, permissions
+from django.db.models import Prefetch
+from django.db import transaction
+from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample, OpenApiParameter
-from .models import Task, Comment
-from .serializers import TaskSerializer, CommentSerializer
+from task_manager.budgets import QueryBudgetMixin
+from .analytics import time_in_status
+from .archive import IncludeArchivedMixin
+from .filters import CommentFilter, TaskFilter
+from .events import broker, comment_event
+from .models import ArchivedComment, ArchivedTask, Task, Comment
+from .pagination import CommentPagination
+from .serializers import (
+    TaskSerializer, CommentSerializer, BulkCommentSerializer, TaskBatchQuerySerializer, TaskBatchSerializer,
+    StatusAnalyticsQuerySerializer, StatusAnalyticsSerializer,
+)
 from .permissions import IsAdmin, IsTaskAssignee, IsActiveUser, CanCommentOnOwnTasks
 
 
@@ -14,14 +26,16 @@ from .permissions import IsAdmin, IsTaskAssignee, IsActiveUser, CanCommentOnOwnT
         summary="List tasks",
         description="Get a paginated list of tasks. Admins see all tasks, users see only their assigned tasks.",
         parameters=[
-            OpenApiParameter(name='status', description='Filter by task status'),
-            OpenApiParameter(name='assigned_to', description='Filter by assigned user ID'),
             OpenApiParameter(name='search', description='Search in title and description'),
+            OpenApiParameter(name='include_archived', type=bool, description='Also return archived Done tasks'),
         ]
     ),
     retrieve=extend_schema(
         summary="Get task details",
-        description="Retrieve details of a specific task"
+        description="Retrieve details of a specific task",
+        parameters=[
+            OpenApiParameter(name='include_archived', type=bool, description='Also look up archived tasks'),
+        ]
     ),
     create=extend_schema(
         summary="Create task",
@@ -49,13 +63,38 @@ from .permissions import IsAdmin, IsTaskAssignee, IsActiveUser, CanCommentOnOwnT
     destroy=extend_schema(
         summary="Delete task",
         description="Permanently delete a task (Admin only)"
+    ),
+    batch=[
+        extend_schema(
+            methods=['GET'],
+            summary="Get many tasks",
+            description="Fetch up to TASK_BATCH_MAX_IDS tasks by ID in one request. "
+                        "IDs you cannot access are listed under forbidden, unknown IDs under missing.",
+            parameters=[OpenApiParameter(name='ids', description='Comma-separated task IDs, e.g. 1,2,3', required=True)],
+            responses=TaskBatchSerializer
+        ),
+        extend_schema(
+            methods=['POST'],
+            summary="Get many tasks (POST)",
+            description="Same as GET with the IDs in the request body, for lists too long for a URL.",
+            request=TaskBatchQuerySerializer,
+            responses=TaskBatchSerializer
+        ),
+    ],
+    status_analytics=extend_schema(
+        summary="Time-in-status analytics",
+        description="Average and percentile time tasks spent in each status, per assignee and period. "
+                    "Users only see statistics for their own tasks.",
+        parameters=[StatusAnalyticsQuerySerializer],
+        responses=StatusAnalyticsSerializer(many=True)
     )
 )
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(QueryBudgetMixin, IncludeArchivedMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
+    query_budget_scope = 'tasks'
     serializer_class = TaskSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['status', 'assigned_to']
+    filterset_class = TaskFilter
     search_fields = ['title', 'description']
 
     def get_permissions(self):
@@ -67,9 +106,21 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         if self.request.user.role == 'Admin':
-            return Task.objects.all()
+            queryset = Task.objects.all()
+        else:
+            queryset = Task.objects.filter(assigned_to=self.request.user)
+        return queryset.select_related('assigned_to').prefetch_related(
+            Prefetch('comments', queryset=Comment.objects.select_related('author'))
+        )
+
+    def get_archived_queryset(self):
+        if self.request.user.role == 'Admin':
+            queryset = ArchivedTask.objects.all()
         else:
-            return Task.objects.filter(assigned_to=self.request.user)
+            queryset = ArchivedTask.objects.filter(assigned_to=self.request.user)
+        return queryset.select_related('assigned_to').prefetch_related(
+            Prefetch('comments', queryset=ArchivedComment.objects.select_related('author'))
+        )
 
     def check_object_permissions(self, request, obj):
         if request.user.role == 'Admin':
@@ -81,18 +132,57 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         return super().check_object_permissions(request, obj)
 
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        query = TaskBatchQuerySerializer(data=request.query_params if request.method == 'GET' else request.data)
+        query.is_valid(raise_exception=True)
+        ids = query.validated_data['ids']
+
+        # Visibility comes from get_queryset in the same query that loads the
+        # tasks, replacing a check_object_permissions round trip per ID.
+        tasks = self.get_queryset().filter(pk__in=ids).in_bulk()
+        forbidden = set()
+        if len(tasks) < len(ids):
+            unseen = [pk for pk in ids if pk not in tasks]
+            forbidden = set(Task.objects.filter(pk__in=unseen).values_list('pk', flat=True))
+
+        return Response({
+            'results': self.get_serializer([tasks[pk] for pk in ids if pk in tasks], many=True).data,
+            'forbidden': [pk for pk in ids if pk in forbidden],
+            'missing': [pk for pk in ids if pk not in tasks and pk not in forbidden],
+        })
+
+    @action(detail=False, methods=['get'], url_path='status-analytics')
+    def status_analytics(self, request):
+        query = StatusAnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        user_id = params.get('user')
+        if request.user.role != 'Admin':
+            user_id = request.user.id
+
+        try:
+            rows = time_in_status(params['start'], params['end'], params.get('interval'), user_id)
+        except NotImplementedError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response(StatusAnalyticsSerializer(rows, many=True).data)
+
 
 @extend_schema_view(
     list=extend_schema(
         summary="List comments",
         description="Get a list of comments. Admins see all comments, users see only comments on their assigned tasks.",
         parameters=[
-            OpenApiParameter(name='task', description='Filter by task ID'),
+            OpenApiParameter(name='include_archived', type=bool, description='Also return comments on archived tasks'),
         ]
     ),
     retrieve=extend_schema(
         summary="Get comment details",
-        description="Retrieve details of a specific comment"
+        description="Retrieve details of a specific comment",
+        parameters=[
+            OpenApiParameter(name='include_archived', type=bool, description='Also look up archived comments'),
+        ]
     ),
     create=extend_schema(
         summary="Create comment",
@@ -118,20 +208,75 @@ class TaskViewSet(viewsets.ModelViewSet):
     destroy=extend_schema(
         summary="Delete comment",
         description="Delete a comment you authored"
+    ),
+    bulk_create=extend_schema(
+        summary="Create many comments",
+        description="Add up to COMMENT_BULK_MAX_ITEMS comments, possibly on different tasks, in one request. "
+                    "Either all comments are created or none.",
+        request=BulkCommentSerializer,
+        responses={201: CommentSerializer(many=True)},
+        examples=[
+            OpenApiExample(
+                'Bulk Create Example',
+                value={'comments': [{'task': 1, 'content': 'Deployed to staging.'}, {'task': 2, 'content': 'Blocked on review.'}]},
+                request_only=True
+            )
+        ]
     )
 )
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(QueryBudgetMixin, IncludeArchivedMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
+    query_budget_scope = 'comments'
     serializer_class = CommentSerializer
     permission_classes = [CanCommentOnOwnTasks]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['task']
+    filterset_class = CommentFilter
+    pagination_class = CommentPagination
 
     def get_queryset(self):
         if self.request.user.role == 'Admin':
-            return Comment.objects.all()
+            queryset = Comment.objects.all()
+        else:
+            queryset = Comment.objects.filter(task__assigned_to=self.request.user)
+        return queryset.select_related('author')
+
+    def get_archived_queryset(self):
+        if self.request.user.role == 'Admin':
+            queryset = ArchivedComment.objects.all()
         else:
-            return Comment.objects.filter(task__assigned_to=self.request.user)
+            queryset = ArchivedComment.objects.filter(task__assigned_to=self.request.user)
+        return queryset.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
\ No newline at end of file
+        serializer.save(author=self.request.user)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        serializer = BulkCommentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['comments']
+
+        # One query checks every referenced task, instead of one per comment
+        # in CanCommentOnOwnTasks.
+        task_ids = {item['task'] for item in items}
+        assignees = dict(Task.objects.filter(pk__in=task_ids).values_list('pk', 'assigned_to_id'))
+        unknown = sorted(task_ids - assignees.keys())
+        if unknown:
+            raise ValidationError({'comments': f"Unknown task IDs: {', '.join(map(str, unknown))}"})
+        denied = sorted(
+            task_id for task_id, assignee_id in assignees.items()
+            if request.user.role != 'Admin' and assignee_id != request.user.pk
+        )
+        if denied:
+            raise PermissionDenied(f"You can only comment on your own tasks: {', '.join(map(str, denied))}")
+
+        with transaction.atomic():
+            comments = Comment.objects.bulk_create(
+                Comment(task_id=item['task'], author=request.user, content=item['content']) for item in items
+            )
+            # bulk_create skips the post_save signal that publishes live events.
+            for comment in comments:
+                event = comment_event('comment.created', comment, assignees[comment.task_id])
+                transaction.on_commit(lambda event=event: broker.publish(event))
+
+        return Response(CommentSerializer(comments, many=True).data, status=status.HTTP_201_CREATED)
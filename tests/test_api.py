@@ -3,7 +3,52 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from tasks.models import Task, Comment
+import asyncio
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import DatabaseError, connection, connections
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.exceptions import TokenError
+from task_manager.asgi import application as asgi_application
+from task_manager.budgets import QueryBudget
+from task_manager.compression import CODECS, brotli, compress_sequence, negotiate_encoding, zstandard
+from task_manager.middleware import CompressionMiddleware
+from task_manager.parsers import FastJSONParser
+from task_manager.renderers import FastJSONRenderer, msgpack
+from task_manager.schema import get_code_version, schema_cache, write_artifact
+from task_manager.startup import warm_up
+from tasks.analytics import time_in_status
+from tasks.archive import archive_done_tasks
+from tasks.events import broker, task_event
+from tasks.models import ArchivedTask, Task, Comment, TaskReminder, TaskStatusChange
+from tasks.reminders import schedule_reminders
+from users.checks import check_revocation_cache
+from users.hashers import HashingPool
+from users.models import OffboardingJob
+from users.revocation import BloomFilter, revocation_list
+from users.tokens import RevocableAccessToken, RevocableRefreshToken
 
 User = get_user_model()
 
@@ -113,4 +158,1071 @@ class RBACTestCase(APITestCase):
         # Try as admin
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.patch(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenRevocationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        revocation_list.reset()
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+
+    def login(self, email, password):
+        response = self.client.post(reverse('token_obtain_pair'), {'email': email, 'password': password})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        tokens = self.login('user@example.com', 'user123')
+        url = reverse('token_refresh')
+
+        response = self.client.post(url, {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['refresh'], tokens['refresh'])
+
+        response = self.client.post(url, {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_soft_deleted_user_tokens_are_revoked(self):
+        tokens = self.login('user@example.com', 'user123')
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(reverse('user-soft-delete', kwargs={'pk': self.regular_user.id}))
+        self.client.force_authenticate(user=None)
+
+        with self.assertRaises(TokenError):
+            RevocableRefreshToken(tokens['refresh'])
+        with self.assertRaises(TokenError):
+            RevocableAccessToken(tokens['access'])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f'jti:{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'other:{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_revocations_past_bloom_capacity_stay_revoked(self):
+        exp = time.time() + 3600
+        with override_settings(TOKEN_REVOCATION=dict(settings.TOKEN_REVOCATION, BLOOM_CAPACITY=10)):
+            for i in range(15):
+                revocation_list.revoke_token(f'j{i}', exp)
+            self.assertTrue(all(revocation_list.is_token_revoked(f'j{i}') for i in range(15)))
+
+            # A new process replays only the tail of the log.
+            revocation_list.reset()
+            self.assertTrue(all(revocation_list.is_token_revoked(f'j{i}') for i in range(15)))
+            self.assertFalse(revocation_list.is_token_revoked('other'))
+
+    def test_rebuilt_bloom_filter_is_sized_from_live_revocations(self):
+        clock = [time.time()]
+        jwt = dict(settings.SIMPLE_JWT, ACCESS_TOKEN_LIFETIME=timedelta(seconds=1),
+                   REFRESH_TOKEN_LIFETIME=timedelta(seconds=1))
+        with override_settings(TOKEN_REVOCATION=dict(settings.TOKEN_REVOCATION, BLOOM_CAPACITY=10), SIMPLE_JWT=jwt), \
+                mock.patch('time.time', lambda: clock[0]), \
+                mock.patch('users.revocation.BloomFilter', wraps=BloomFilter) as bloom_filter, \
+                mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            # At most 10 one-second revocations are live at any time.
+            for batch in range(5):
+                for i in range(10):
+                    revocation_list.revoke_token(f'b{batch}-{i}', clock[0] + 1)
+                self.assertTrue(all(revocation_list.is_token_revoked(f'b{batch}-{i}') for i in range(10)))
+                clock[0] += 2
+
+        self.assertGreater(bloom_filter.call_count, 1)
+        self.assertEqual({call.args[0] for call in bloom_filter.call_args_list}, {10})
+        # Rebuilds replay only log entries recorded within the token lifetime.
+        self.assertLessEqual(max(len(call.args[0]) for call in get_many.call_args_list), 2)
+
+    def test_deploy_check_warns_about_process_local_cache(self):
+        self.assertEqual([warning.id for warning in check_revocation_cache(None)], ['users.W001'])
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost'}}
+        with override_settings(CACHES=redis):
+            self.assertEqual(check_revocation_cache(None), [])
+
+
+class PasswordHashingTestCase(APITestCase):
+    def test_login_rehashes_password_with_preferred_hasher(self):
+        user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+        )
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        with override_settings(PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES['scrypt']):
+            response = self.client.post(reverse('token_obtain_pair'), {'email': 'user@example.com', 'password': 'user123'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith('scrypt$'))
+            self.assertTrue(user.check_password('user123'))
+
+    def test_busy_hashing_pool_rejects_login(self):
+        User.objects.create_superuser(email='admin@example.com', full_name='Admin User', password='admin123')
+        pool = HashingPool()
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait()
+
+        with override_settings(PASSWORD_HASHING={'POOL_WORKERS': 1, 'POOL_QUEUE': 0, 'POOL_TIMEOUT': 0.01}):
+            # Occupy the only slot with a hash that waits until released.
+            holder = threading.Thread(target=pool.run, args=(slow_hash,))
+            holder.start()
+            try:
+                started.wait()
+                with mock.patch('users.hashers.hashing_pool', pool):
+                    api_response = self.client.post(
+                        reverse('token_obtain_pair'), {'email': 'admin@example.com', 'password': 'admin123'}
+                    )
+                    admin_response = self.client.post(
+                        reverse('admin:login'), {'username': 'admin@example.com', 'password': 'admin123'}
+                    )
+            finally:
+                release.set()
+                holder.join()
+                pool.shutdown()
+        self.assertEqual(api_response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(admin_response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class SchemaCacheTestCase(APITestCase):
+    def setUp(self):
+        schema_cache.clear()
+
+    def test_schema_is_served_with_etag(self):
+        url = reverse('schema')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'/api/tasks/', response.content)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_schema_is_served_precompressed(self):
+        url = reverse('schema')
+        plain = self.client.get(url, {'format': 'json'})
+        compressed = self.client.get(url, {'format': 'json'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+
+        response = self.client.get(url, {'format': 'json'}, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=compressed['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], compressed['ETag'])
+        # The gzip ETag does not validate the identity body.
+        response = self.client.get(url, {'format': 'json'}, HTTP_IF_NONE_MATCH=compressed['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_schema_artifact_is_used_when_version_matches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'openapi.json'
+            write_artifact(path, get_code_version(), {'openapi': '3.0.3', 'paths': {'/from-artifact/': {}}})
+            with override_settings(SCHEMA_CACHE={'ARTIFACT': path, 'CODE_VERSION': None}):
+                self.assertIn('/from-artifact/', schema_cache.get_schema()['paths'])
+                schema_cache.clear()
+                with override_settings(SCHEMA_CACHE={'ARTIFACT': path, 'CODE_VERSION': 'other'}):
+                    self.assertNotIn('/from-artifact/', schema_cache.get_schema()['paths'])
+
+
+class APIMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+
+    def test_api_requests_skip_session_and_csrf(self):
+        access = RevocableRefreshToken.for_user(self.regular_user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    def test_admin_keeps_session_and_csrf(self):
+        response = self.client.get(reverse('admin:login'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+        self.assertIn('csrftoken', response.cookies)
+
+
+class RendererTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.task = Task.objects.create(
+            title='Tâche \u2028\u2029 with separators',
+            description='Ünïcode description',
+            assigned_to=self.admin_user
+        )
+        Comment.objects.create(task=self.task, author=self.admin_user, content='First comment')
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_fast_json_renderer_matches_stdlib_bytes(self):
+        data = self.client.get(reverse('task-list')).data
+        extra = {'decimal': Decimal('1.50'), 'when': timezone.now(), 'day': date(2025, 1, 2), 1: 'int key', 'big': 2 ** 70}
+        floats = {'seconds': [0.0, -0.0, 2.5, 1 / 3, 3600.0, 1e15, 1e16, 1.5e-7, 1e-5, 1e-4, 1e300], 1e20: 'float key'}
+        for payload in (data, extra, floats, {'nested': [data, extra, floats]}):
+            self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+        self.assertEqual(FastJSONRenderer().render({'value': [float('nan'), float('inf')]}), b'{"value":[null,null]}')
+
+    def test_fast_json_parser_matches_stdlib(self):
+        body = JSONRenderer().render({'title': 'Tâche', 'items': [1, 2.5, None, True]})
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"invalid'))
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_content_negotiation(self):
+        url = reverse('task-list')
+        json_response = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), json.loads(json_response.content))
+
+        body = msgpack.packb({'task': self.task.id, 'content': 'Packed comment'})
+        response = self.client.post(reverse('comment-list'), body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Comment.objects.filter(content='Packed comment').exists())
+
+
+class CompressionTestCase(APITestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        for i in range(10):
+            Task.objects.create(title=f'Task {i}', description='Repetitive description ' * 20, assigned_to=self.admin_user)
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_task_list_is_gzipped(self):
+        url = reverse('task-list')
+        plain = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse('comment-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_admin_pages_are_not_compressed(self):
+        response = self.client.get(reverse('admin:login'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertIn('csrftoken', response.cookies)
+        self.assertGreater(len(response.content), settings.RESPONSE_COMPRESSION['MIN_SIZE'])
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_response_is_compressed_and_etag_weakened(self):
+        chunks = [f'{{"id": {i}, "title": "Task {i}"}}\n'.encode() for i in range(500)]
+
+        def view(request):
+            response = StreamingHttpResponse(iter(chunks), content_type='application/x-ndjson')
+            response['ETag'] = '"export-v1"'
+            return response
+
+        request = self.factory.get('/api/tasks/export/', HTTP_ACCEPT_ENCODING='gzip')
+        response = CompressionMiddleware(view)(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], 'W/"export-v1"')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(chunks))
+
+    def test_streamed_chunks_are_decodable_as_they_arrive(self):
+        decoders = {
+            'gzip': lambda: zlib.decompressobj(31).decompress,
+            'br': lambda: brotli.Decompressor().process,
+            'zstd': lambda: zstandard.ZstdDecompressor().decompressobj().decompress,
+        }
+        chunks = [f'{{"id": {i}}}\n'.encode() for i in range(3)]
+        for name, codec in CODECS.items():
+            with self.subTest(codec=name):
+                decode = decoders[name]()
+                stream = compress_sequence(codec, 5, iter(chunks))
+                for chunk in chunks:
+                    self.assertEqual(decode(next(stream)), chunk)
+
+    def test_preferred_encoding_is_negotiated(self):
+        self.assertEqual(negotiate_encoding('gzip, br;q=0', ['br', 'gzip']), 'gzip')
+        self.assertIsNone(negotiate_encoding('identity', ['br', 'gzip']))
+        if 'zstd' in CODECS:
+            self.assertEqual(negotiate_encoding('gzip, zstd', ['zstd', 'gzip']), 'zstd')
+
+
+class TaskEventsTestCase(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+        self.task = Task.objects.create(title='User Task', description='Task', assigned_to=self.regular_user)
+        self.admin_task = Task.objects.create(title='Admin Task', description='Task', assigned_to=self.admin_user)
+
+    def access_token(self, user):
+        return str(RevocableRefreshToken.for_user(user).access_token)
+
+    async def test_subscribers_only_receive_their_tasks(self):
+        user_subscription = broker.subscribe(self.regular_user)
+        admin_subscription = broker.subscribe(self.admin_user)
+        try:
+            broker.publish(task_event('task.updated', self.admin_task))
+            broker.publish(task_event('task.updated', self.task))
+            await asyncio.sleep(0)
+
+            event = await asyncio.wait_for(user_subscription.get(), 1)
+            self.assertEqual(event['data']['task_id'], self.task.id)
+            self.assertTrue(user_subscription.queue.empty())
+            self.assertEqual(admin_subscription.queue.qsize(), 2)
+        finally:
+            broker.unsubscribe(user_subscription)
+            broker.unsubscribe(admin_subscription)
+
+    async def test_slow_subscriber_is_told_to_resync(self):
+        with override_settings(TASK_EVENTS={'QUEUE_SIZE': 3}):
+            subscription = broker.subscribe(self.admin_user)
+        try:
+            for _ in range(5):
+                broker.publish(task_event('task.updated', self.task))
+            await asyncio.sleep(0)
+
+            events = [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+            self.assertEqual([event['type'] for event in events], ['resync', 'task.updated'])
+        finally:
+            broker.unsubscribe(subscription)
+
+    async def test_sse_stream_delivers_task_updates(self):
+        response = await self.async_client.get(reverse('task-events'), {'token': self.access_token(self.regular_user)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+
+        reader = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        def update_task():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.task.status = Task.Status.DONE
+                self.task.save()
+
+        await sync_to_async(update_task)()
+        chunk = await asyncio.wait_for(reader, 1)
+        self.assertIn(b'event: task.updated', chunk)
+        self.assertIn(b'"status": "Done"', chunk)
+
+        # A client disconnect cancels the task consuming the stream.
+        reader = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        reader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await reader
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_sse_stream_requires_authentication(self):
+        response = await self.async_client.get(reverse('task-events'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_sse_stream_is_not_served_over_wsgi(self):
+        response = self.client.get(reverse('task-events'), {'token': self.access_token(self.regular_user)})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    @override_settings(TASK_EVENTS={'HEARTBEAT_INTERVAL': 0.05})
+    async def test_sse_stream_ends_when_user_is_revoked(self):
+        await sync_to_async(cache.clear)()
+        revocation_list.reset()
+        response = await self.async_client.get(reverse('task-events'), {'token': self.access_token(self.regular_user)})
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        self.assertEqual(await asyncio.wait_for(anext(stream), 1), b': keepalive\n\n')
+
+        revocation_list.revoke_user(self.regular_user.pk)
+        self.assertIn(b'event: unauthorized', await asyncio.wait_for(anext(stream), 1))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(broker.subscriber_count(), 0)
+        revocation_list.reset()
+
+    async def test_websocket_closes_when_token_expires(self):
+        token = RevocableRefreshToken.for_user(self.regular_user).access_token
+        token.set_exp(lifetime=timedelta(seconds=1))
+        incoming = asyncio.Queue()
+        outgoing = asyncio.Queue()
+        await incoming.put({'type': 'websocket.connect'})
+        scope = {'type': 'websocket', 'path': '/api/ws/tasks/', 'query_string': f'token={token}'.encode()}
+        connection = asyncio.ensure_future(asgi_application(scope, incoming.get, outgoing.put))
+
+        self.assertEqual((await asyncio.wait_for(outgoing.get(), 1))['type'], 'websocket.accept')
+        self.assertEqual(await asyncio.wait_for(outgoing.get(), 3), {'type': 'websocket.close', 'code': 4401})
+        await asyncio.wait_for(connection, 1)
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_websocket_receives_comment_events(self):
+        incoming = asyncio.Queue()
+        outgoing = asyncio.Queue()
+        await incoming.put({'type': 'websocket.connect'})
+        scope = {'type': 'websocket', 'path': '/api/ws/tasks/',
+                 'query_string': f'token={self.access_token(self.regular_user)}'.encode()}
+        connection = asyncio.ensure_future(asgi_application(scope, incoming.get, outgoing.put))
+
+        self.assertEqual((await asyncio.wait_for(outgoing.get(), 1))['type'], 'websocket.accept')
+
+        def add_comment():
+            with self.captureOnCommitCallbacks(execute=True):
+                Comment.objects.create(task=self.task, author=self.regular_user, content='Hello')
+
+        await sync_to_async(add_comment)()
+        message = await asyncio.wait_for(outgoing.get(), 1)
+        self.assertEqual(json.loads(message['text'])['type'], 'comment.created')
+
+        await incoming.put({'type': 'websocket.disconnect', 'code': 1000})
+        await asyncio.wait_for(connection, 1)
+        self.assertEqual(broker.subscriber_count(), 0)
+
+
+class TaskArchiveTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+        self.old_task = Task.objects.create(title='Old Done Task', description='Task', status='Done', assigned_to=self.regular_user)
+        self.recent_task = Task.objects.create(title='Recent Done Task', description='Task', status='Done', assigned_to=self.regular_user)
+        self.open_task = Task.objects.create(title='Open Task', description='Task', assigned_to=self.regular_user)
+        self.other_task = Task.objects.create(title='Other Done Task', description='Task', status='Done', assigned_to=self.admin_user)
+        Comment.objects.create(task=self.old_task, author=self.regular_user, content='Finished')
+        Task.objects.filter(id__in=[self.old_task.id, self.other_task.id]).update(updated_at=timezone.now() - timedelta(days=365))
+        call_command('archive_tasks', days=90, batch_size=1, stdout=io.StringIO())
+
+    def test_archive_moves_old_done_tasks_and_comments(self):
+        self.assertFalse(Task.objects.filter(id=self.old_task.id).exists())
+        self.assertFalse(Comment.objects.filter(task_id=self.old_task.id).exists())
+        self.assertEqual(ArchivedTask.objects.count(), 2)
+        self.assertEqual(ArchivedTask.objects.get(id=self.old_task.id).comments.get().content, 'Finished')
+        self.assertTrue(Task.objects.filter(id=self.recent_task.id).exists())
+
+    def test_archiving_publishes_no_deleted_events(self):
+        Task.objects.filter(id=self.recent_task.id).update(updated_at=timezone.now() - timedelta(days=365))
+        with mock.patch.object(broker, 'publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(list(archive_done_tasks(timezone.now() - timedelta(days=90))), [1])
+        publish.assert_not_called()
+        self.assertTrue(ArchivedTask.objects.filter(id=self.recent_task.id).exists())
+
+    def test_list_includes_archived_only_when_requested(self):
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse('task-list')
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['count'], 2)
+
+        response = self.client.get(url, {'include_archived': 'true', 'status': 'Done'})
+        self.assertEqual(response.data['count'], 2)
+        titles = {task['title']: task for task in response.data['results']}
+        self.assertEqual(set(titles), {'Old Done Task', 'Recent Done Task'})
+        self.assertEqual(titles['Old Done Task']['comments_count'], 1)
+
+    def test_retrieve_archived_task(self):
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse('task-detail', kwargs={'pk': self.old_task.id})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(url, {'include_archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Old Done Task')
+
+        url = reverse('task-detail', kwargs={'pk': self.other_task.id})
+        self.assertEqual(self.client.get(url, {'include_archived': 'true'}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_list_includes_archived(self):
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(reverse('comment-list'), {'include_archived': '1', 'task': self.old_task.id})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['content'], 'Finished')
+
+
+class TaskStatusHistoryTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+
+    def test_status_transitions_are_logged(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New Task', 'description': 'Task', 'assigned_to_id': self.regular_user.id
+        })
+        task_id = response.data['id']
+
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse('task-detail', kwargs={'pk': task_id})
+        self.client.patch(url, {'title': 'Renamed'})
+        self.client.patch(url, {'status': 'InProgress'})
+
+        changes = TaskStatusChange.objects.filter(task_id=task_id)
+        self.assertEqual(
+            [(c.from_status, c.to_status, c.changed_by_id) for c in changes],
+            [(None, 1, self.admin_user.id), (1, 2, self.regular_user.id)],
+        )
+
+    def test_time_in_status_percentiles(self):
+        start = timezone.now() - timedelta(days=10)
+        for task_id, hours_in_progress in enumerate([1, 2, 3, 4, 10], start=1):
+            TaskStatusChange.objects.create(task_id=task_id, assignee=self.regular_user, from_status=None, to_status=1, changed_at=start)
+            in_progress_at = start + timedelta(hours=1)
+            TaskStatusChange.objects.create(task_id=task_id, assignee=self.regular_user, from_status=1, to_status=2, changed_at=in_progress_at)
+            TaskStatusChange.objects.create(task_id=task_id, assignee=self.regular_user, from_status=2, to_status=3,
+                                            changed_at=in_progress_at + timedelta(hours=hours_in_progress))
+
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(reverse('task-status-analytics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row['status']: row for row in response.data}
+        self.assertEqual(set(rows), {'ToDo', 'InProgress'})
+        self.assertEqual(rows['InProgress']['count'], 5)
+        self.assertAlmostEqual(rows['InProgress']['p50_seconds'], 3 * 3600, delta=1)
+        self.assertAlmostEqual(rows['InProgress']['p90_seconds'], 10 * 3600, delta=1)
+        self.assertAlmostEqual(rows['InProgress']['avg_seconds'], 4 * 3600, delta=1)
+        self.assertAlmostEqual(rows['ToDo']['p95_seconds'], 3600, delta=1)
+
+    def test_users_only_see_their_own_analytics(self):
+        TaskStatusChange.objects.create(task_id=1, assignee=self.admin_user, to_status=1, changed_at=timezone.now() - timedelta(days=1))
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(reverse('task-status-analytics'), {'user': self.admin_user.id, 'interval': 'day'})
+        self.assertEqual(response.data, [])
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse('task-status-analytics'), {'user': self.admin_user.id, 'interval': 'day'})
+        self.assertEqual(len(response.data), 1)
+
+    def test_weekly_periods_are_iso_weeks(self):
+        days = [date(2023, 1, 1), date(2024, 12, 30), date(2021, 1, 4), date(2026, 6, 14), date(2026, 6, 15)]
+        for task_id, day in enumerate(days, start=1):
+            changed_at = timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=12))
+            TaskStatusChange.objects.create(task_id=task_id, assignee=self.regular_user, to_status=1, changed_at=changed_at)
+
+        rows = time_in_status(
+            timezone.make_aware(datetime(2020, 1, 1)), timezone.make_aware(datetime(2027, 1, 1)), interval='week'
+        )
+        expected = {'%d-W%02d' % day.isocalendar()[:2] for day in days}
+        self.assertEqual({row['period'] for row in rows}, expected)
+        self.assertIn('2022-W52', expected)
+
+    def test_unsupported_database_is_rejected_cleanly(self):
+        self.client.force_authenticate(user=self.regular_user)
+        with mock.patch('tasks.analytics.connection') as mocked:
+            mocked.vendor = 'oracle'
+            response = self.client.get(reverse('task-status-analytics'))
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertIn('not supported on oracle', response.data['error'])
+
+
+class TaskBatchTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+        self.own_tasks = [
+            Task.objects.create(title=f'Own {i}', description='Task', assigned_to=self.regular_user) for i in range(3)
+        ]
+        self.other_task = Task.objects.create(title='Other', description='Task', assigned_to=self.admin_user)
+        for task in self.own_tasks:
+            Comment.objects.create(task=task, author=self.regular_user, content='Comment')
+        self.url = reverse('task-batch')
+
+    def test_batch_get_reports_found_forbidden_and_missing(self):
+        self.client.force_authenticate(user=self.regular_user)
+        ids = [self.own_tasks[2].id, self.other_task.id, 9999, self.own_tasks[0].id, self.own_tasks[2].id]
+        response = self.client.get(self.url, {'ids': ','.join(map(str, ids))})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['results']], [self.own_tasks[2].id, self.own_tasks[0].id])
+        self.assertEqual(response.data['results'][0]['comments_count'], 1)
+        self.assertEqual(response.data['forbidden'], [self.other_task.id])
+        self.assertEqual(response.data['missing'], [9999])
+
+    def test_batch_post_uses_constant_queries(self):
+        self.client.force_authenticate(user=self.admin_user)
+        ids = [task.id for task in self.own_tasks] + [self.other_task.id]
+        # Tasks with their assignees, then comments with their authors.
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, {'ids': ids}, format='json')
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(response.data['forbidden'], [])
+
+    @override_settings(TASK_BATCH_MAX_IDS=2)
+    def test_batch_size_is_capped(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.url, {'ids': '1,2,3'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'ids': '1,x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkDeactivateTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        revocation_list.reset()
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.leavers = [
+            User.objects.create_user(email=f'leaver{i}@example.com', full_name=f'Leaver {i}', password='user123')
+            for i in range(2)
+        ]
+        self.successor = User.objects.create_user(email='successor@example.com', full_name='Successor', password='user123')
+        for user in self.leavers:
+            for task_status in ['ToDo', 'InProgress', 'Done']:
+                Task.objects.create(title=f'{task_status} task', description='Task', status=task_status, assigned_to=user)
+        self.url = reverse('user-bulk-deactivate')
+        self.payload = {'user_ids': [user.id for user in self.leavers], 'reassign_to': self.successor.id}
+
+    def test_small_job_runs_inline(self):
+        tokens = self.client.post(reverse('token_obtain_pair'), {'email': 'leaver0@example.com', 'password': 'user123'}).data
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'Completed')
+        self.assertEqual(response.data['deactivated_users'], 2)
+        self.assertEqual(response.data['reassigned_tasks'], 4)
+        self.assertFalse(User.objects.filter(pk__in=self.payload['user_ids'], is_active=True).exists())
+        self.assertEqual(Task.objects.filter(assigned_to=self.successor).count(), 4)
+        self.assertEqual(Task.objects.filter(assigned_to__in=self.leavers, status='Done').count(), 2)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_reassignment_publishes_task_events(self):
+        self.client.force_authenticate(user=self.admin_user)
+        with mock.patch.object(broker, 'publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, self.payload, format='json')
+        events = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual(len(events), 4)
+        for event in events:
+            self.assertEqual(event['type'], 'task.updated')
+            self.assertIn(self.successor.id, event['recipients'])
+            self.assertTrue(set(event['recipients']) & set(self.payload['user_ids']))
+
+    def test_failed_job_is_reported_and_can_be_resumed(self):
+        self.client.force_authenticate(user=self.admin_user)
+        with mock.patch('users.offboarding.reassign_open_tasks', side_effect=DatabaseError('disk I/O error')):
+            with self.assertLogs('users.offboarding', 'ERROR'):
+                response = self.client.post(self.url, self.payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual((response.data['status'], response.data['error']), ('Failed', 'disk I/O error'))
+        self.assertTrue(response['Location'].endswith(f"/offboarding-jobs/{response.data['id']}/"))
+
+        call_command('run_offboarding_jobs', stdout=io.StringIO())
+        self.assertEqual(OffboardingJob.objects.get().status, 'Failed')
+        call_command('run_offboarding_jobs', '--retry-failed', stdout=io.StringIO())
+        job = OffboardingJob.objects.get()
+        self.assertEqual((job.status, job.error, job.deactivated_users), ('Completed', '', 2))
+        self.assertEqual((job.reassigned_tasks, job.total_tasks), (4, 4))
+
+    @override_settings(USER_OFFBOARDING={'BACKGROUND': 'command', 'STALE_AFTER': 60})
+    def test_stalled_job_is_claimed_again(self):
+        job = OffboardingJob.objects.create(
+            user_ids=self.payload['user_ids'], reassign_to=self.successor, status='Running',
+            heartbeat_at=timezone.now(),
+        )
+        call_command('run_offboarding_jobs', stdout=io.StringIO())
+        self.assertEqual(OffboardingJob.objects.get(pk=job.pk).status, 'Running')
+
+        OffboardingJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=5))
+        call_command('run_offboarding_jobs', stdout=io.StringIO())
+        self.assertEqual(OffboardingJob.objects.get(pk=job.pk).status, 'Completed')
+
+    @override_settings(USER_OFFBOARDING={'INLINE_MAX_TASKS': 1, 'CHUNK_SIZE': 3, 'BACKGROUND': 'command'})
+    def test_large_job_runs_in_background(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, self.payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'Pending')
+        self.assertTrue(User.objects.get(pk=self.leavers[0].pk).is_active)
+
+        call_command('run_offboarding_jobs', stdout=io.StringIO())
+        response = self.client.get(response['Location'])
+        self.assertEqual(response.data['status'], 'Completed')
+        self.assertEqual((response.data['reassigned_tasks'], response.data['total_tasks']), (4, 4))
+        self.assertFalse(Task.objects.filter(assigned_to__in=self.leavers).exclude(status='Done').exists())
+
+    def test_invalid_requests_are_rejected(self):
+        self.client.force_authenticate(user=self.admin_user)
+        for payload in [
+            {'user_ids': [self.leavers[0].id], 'reassign_to': self.leavers[0].id},
+            {'user_ids': [self.admin_user.id], 'reassign_to': self.successor.id},
+            {'user_ids': [9999], 'reassign_to': self.successor.id},
+        ]:
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.successor)
+        response = self.client.post(self.url, self.payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(User.objects.get(pk=self.leavers[0].pk).is_active)
+
+
+class UserDirectoryTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123'
+        )
+        for email, full_name in [
+            ('jane.smith@example.com', 'Jane Smith'),
+            ('john.smithers@example.com', 'John Smithers'),
+            ('alice@example.com', 'Alice Jones'),
+            ('bob@corp.example.com', 'Bob Smith'),
+        ]:
+            User.objects.create_user(email=email, full_name=full_name, password='user123')
+        User.objects.filter(email='bob@corp.example.com').update(is_active=False)
+        self.client.force_authenticate(user=self.admin_user)
+
+    def names(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [user['full_name'] for user in response.data['results']]
+
+    def test_prefix_search_on_email_and_name(self):
+        self.assertEqual(self.names(self.client.get(reverse('user-list'), {'search': 'JA'})), ['Jane Smith'])
+        self.assertEqual(self.names(self.client.get(reverse('user_list'), {'search': 'alice@'})), ['Alice Jones'])
+
+    def test_word_search_and_filters(self):
+        response = self.client.get(reverse('user-list'), {'search': 'smith'})
+        self.assertEqual(self.names(response), ['Bob Smith', 'Jane Smith', 'John Smithers'])
+
+        response = self.client.get(reverse('user-list'), {'search': 'smith', 'is_active': 'true', 'ordering': '-full_name'})
+        self.assertEqual(self.names(response), ['John Smithers', 'Jane Smith'])
+
+        response = self.client.get(reverse('user-list'), {'role': 'Admin'})
+        self.assertEqual(self.names(response), ['Admin User'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'FTS5 triggers are SQLite only')
+    def test_migrate_restores_dropped_search_triggers(self):
+        if 'users_search' not in connection.introspection.table_names():
+            self.skipTest('SQLite built without FTS5')
+        with connection.cursor() as cursor:
+            for name in ('users_search_insert', 'users_search_delete', 'users_search_update'):
+                cursor.execute(f'DROP TRIGGER {name}')
+        User.objects.filter(email='alice@example.com').update(full_name='Alice Whitmore')
+        User.objects.create_user(email='carol@example.com', full_name='Carol Whitfield', password='user123')
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+
+        response = self.client.get(reverse('user-list'), {'search': 'whit'})
+        self.assertEqual(self.names(response), ['Alice Whitmore', 'Carol Whitfield'])
+        User.objects.create_user(email='dan@example.com', full_name='Dan Whitby', password='user123')
+        response = self.client.get(reverse('user-list'), {'search': 'whit'})
+        self.assertEqual(self.names(response), ['Alice Whitmore', 'Carol Whitfield', 'Dan Whitby'])
+
+    def test_cursor_pagination_is_stable(self):
+        for i in range(3):
+            User.objects.create_user(email=f'same{i}@example.com', full_name='Same Name', password='user123')
+
+        seen = []
+        url = reverse('user-list') + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen += [user['id'] for user in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(len(seen), User.objects.count())
+        self.assertEqual(seen, list(User.objects.order_by('full_name', 'id').values_list('id', flat=True)))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+class SQLiteTuningTestCase(TestCase):
+    def test_tuned_connection_uses_wal_and_immediate_transactions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = dict(connection.settings_dict, NAME=str(Path(directory) / 'tuned.sqlite3'), OPTIONS=settings.SQLITE_OPTIONS)
+            tuned = type(connections['default'])(settings_dict, alias='tuned')
+            try:
+                with tuned.cursor() as cursor:
+                    pragmas = {
+                        name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                        for name in ['journal_mode', 'synchronous', 'busy_timeout', 'mmap_size']
+                    }
+                self.assertEqual(pragmas, {
+                    'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 20000,
+                    'mmap_size': settings.SQLITE_PRAGMAS['mmap_size'],
+                })
+                self.assertEqual(tuned.transaction_mode, 'IMMEDIATE')
+            finally:
+                tuned.close()
+
+
+class QueryBudgetTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        for i in range(25):
+            task = Task.objects.create(title=f'Task {i}', description='Task', assigned_to=self.admin_user)
+            Comment.objects.create(task=task, author=self.admin_user, content='Comment')
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_task_list_fits_default_budget(self):
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_archived_lists_fit_default_budget(self):
+        Task.objects.update(status=Task.Status.DONE, updated_at=timezone.now() - timedelta(days=365))
+        list(archive_done_tasks(timezone.now()))
+        for name in ('task-list', 'comment-list'):
+            response = self.client.get(reverse(name), {'include_archived': 'true'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 20)
+
+    @override_settings(QUERY_BUDGETS={'tasks': {'MAX_QUERIES': 2}})
+    def test_exceeding_query_budget_returns_503_and_is_counted(self):
+        with self.assertLogs('task_manager.budgets', 'WARNING'):
+            response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data['detail'].code, 'query_budget_exceeded')
+        self.assertEqual(response['Retry-After'], '1')
+
+        response = self.client.get(reverse('task-batch'), {'ids': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        metrics = {row['scope']: row for row in self.client.get(reverse('query-budgets')).data}
+        self.assertEqual(metrics['tasks']['exceeded_queries'], 1)
+        self.assertEqual(metrics['tasks']['timeouts'], 0)
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+    def test_slow_statement_is_interrupted(self):
+        slow_sql = (
+            'WITH RECURSIVE counter(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM counter WHERE n < 100000000) '
+            'SELECT COUNT(*) FROM counter'
+        )
+        with QueryBudget(connection, statement_timeout=0.05) as budget:
+            with self.assertRaises(DatabaseError) as raised, connection.cursor() as cursor:
+                cursor.execute(slow_sql)
+        self.assertTrue(budget.timed_out(raised.exception))
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertEqual(connection.execute_wrappers, [])
+
+
+class TaskDueDateTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.now = timezone.now()
+        self.overdue = Task.objects.create(title='Overdue', description='Task', assigned_to=self.admin_user,
+                                           due_at=self.now - timedelta(hours=2))
+        self.done = Task.objects.create(title='Done late', description='Task', status='Done', assigned_to=self.admin_user,
+                                        due_at=self.now - timedelta(hours=2))
+        self.upcoming = Task.objects.create(title='Upcoming', description='Task', assigned_to=self.admin_user,
+                                            due_at=self.now + timedelta(hours=3))
+        self.later = Task.objects.create(title='Later', description='Task', assigned_to=self.admin_user,
+                                         due_at=self.now + timedelta(days=7))
+        self.undated = Task.objects.create(title='Undated', description='Task', assigned_to=self.admin_user)
+
+    def titles(self, params):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse('task-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(task['title'] for task in response.data['results'])
+
+    def test_due_filters(self):
+        self.assertEqual(self.titles({'overdue': 'true'}), ['Overdue'])
+        self.assertEqual(self.titles({'due_before': (self.now + timedelta(days=1)).isoformat()}),
+                         ['Done late', 'Overdue', 'Upcoming'])
+        self.assertEqual(self.titles({'overdue': 'false', 'status': 'ToDo'}), ['Later', 'Undated', 'Upcoming'])
+
+    @override_settings(TASK_REMINDERS={'LEAD_TIME': timedelta(hours=24), 'BATCH_SIZE': 1})
+    def test_reminders_are_enqueued_once_per_due_date(self):
+        schedule_reminders(now=self.now - timedelta(hours=3), since=self.now - timedelta(days=1))
+        # The next tick only adds the overdue reminder; 'Upcoming' was already reminded.
+        self.assertEqual(schedule_reminders(now=self.now), {'upcoming': 0, 'overdue': 1})
+
+        reminders = set(TaskReminder.objects.values_list('task__title', 'kind'))
+        self.assertEqual(reminders, {('Overdue', 'upcoming'), ('Overdue', 'overdue'), ('Upcoming', 'upcoming')})
+
+        self.assertEqual(schedule_reminders(now=self.now), {'upcoming': 0, 'overdue': 0})
+
+        self.upcoming.due_at = self.now + timedelta(hours=5)
+        self.upcoming.save()
+        self.assertEqual(schedule_reminders(now=self.now, since=self.now - timedelta(hours=1)), {'upcoming': 1, 'overdue': 0})
+
+
+class BulkCommentTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            full_name='Admin User',
+            password='admin123',
+            role='Admin'
+        )
+        self.regular_user = User.objects.create_user(
+            email='user@example.com',
+            full_name='Regular User',
+            password='user123',
+            role='User'
+        )
+        self.own_tasks = [
+            Task.objects.create(title=f'Own {i}', description='Task', assigned_to=self.regular_user) for i in range(2)
+        ]
+        self.other_task = Task.objects.create(title='Other', description='Task', assigned_to=self.admin_user)
+        self.url = reverse('comment-bulk-create')
+
+    def test_bulk_create_checks_ownership_in_one_query(self):
+        self.client.force_authenticate(user=self.regular_user)
+        payload = {'comments': [
+            {'task': task.id, 'content': f'Message {i}'} for i, task in enumerate(self.own_tasks * 3)
+        ]}
+        # Ownership check and one INSERT, plus the savepoint pair of the transaction.
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(Comment.objects.filter(author=self.regular_user).count(), 6)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        self.client.force_authenticate(user=self.regular_user)
+        payload = {'comments': [
+            {'task': self.own_tasks[0].id, 'content': 'Allowed'},
+            {'task': self.other_task.id, 'content': 'Not allowed'},
+        ]}
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Comment.objects.exists())
+
+        response = self.client.post(self.url, {'comments': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_rejects_unknown_tasks(self):
+        missing_id = self.other_task.id + 100
+        for user in (self.regular_user, self.admin_user):
+            self.client.force_authenticate(user=user)
+            payload = {'comments': [
+                {'task': self.own_tasks[0].id, 'content': 'Known'},
+                {'task': missing_id, 'content': 'Unknown'},
+            ]}
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(str(missing_id), str(response.data['comments']))
+        self.assertFalse(Comment.objects.exists())
+
+    def test_comments_for_many_tasks_with_per_task_limit(self):
+        now = timezone.now()
+        for task in self.own_tasks + [self.other_task]:
+            for i in range(4):
+                Comment.objects.create(task=task, author=self.admin_user, content=f'{task.title} #{i}',
+                                       created_at=now + timedelta(minutes=i))
+
+        self.client.force_authenticate(user=self.regular_user)
+        ids = ','.join(str(task.id) for task in self.own_tasks + [self.other_task])
+        response = self.client.get(reverse('comment-list'), {'task__in': ids, 'per_task': 2, 'page_size': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(comment['content'] for comment in response.data['results']),
+            ['Own 0 #2', 'Own 0 #3', 'Own 1 #2', 'Own 1 #3'],
+        )
+
+    def test_task_filter_is_capped(self):
+        self.client.force_authenticate(user=self.regular_user)
+        ids = ','.join(str(i) for i in range(1, 102))
+        response = self.client.get(reverse('comment-list'), {'task__in': ids})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StartupTestCase(TestCase):
+    def test_warm_up_builds_serializers_without_queries(self):
+        with self.assertNumQueries(0):
+            timings = warm_up()
+        self.assertGreater(timings['views'], 5)
+        self.assertGreater(timings['serializers'], 3)
+
+    def test_startup_report_phases(self):
+        out = io.StringIO()
+        call_command('startup_report', '--top', '3', '--warmup', stdout=out)
+        output = out.getvalue()
+        for phase in ('settings', 'apps ready', 'urlconf', 'warmup', 'total'):
+            self.assertIn(phase, output)
+
+    def test_docs_disabled_skips_schema_generator(self):
+        script = (
+            'import sys, django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns; '
+            'print("drf_spectacular.openapi" in sys.modules, "drf_spectacular.views" in sys.modules)'
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='task_manager.settings', DJANGO_API_DOCS='0')
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ['False', 'False'])
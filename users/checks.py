@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .revocation import get_revocation_setting
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.security, deploy=True)
+def check_revocation_cache(app_configs, **kwargs):
+    alias = get_revocation_setting('CACHE_ALIAS')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Warning(
+            f"TOKEN_REVOCATION['CACHE_ALIAS'] ({alias!r}) uses {backend}, which is not shared between processes.",
+            hint='Rotated refresh tokens and soft-deleted users are then only revoked in the worker that '
+                 'revoked them. Point the alias at a shared cache, e.g. set DJANGO_REDIS_URL.',
+            id='users.W001',
+        )]
+    return []
@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+DEFAULTS = {
+    'POOL_WORKERS': os.cpu_count() or 1,
+    'POOL_QUEUE': 32,
+    'POOL_TIMEOUT': 10,
+    'PBKDF2': {},
+    'SCRYPT': {},
+    'ARGON2': {},
+}
+
+
+def get_hashing_setting(name):
+    return getattr(settings, 'PASSWORD_HASHING', {}).get(name, DEFAULTS[name])
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Authentication service is busy, please retry shortly.'
+    default_code = 'hashing_pool_busy'
+
+
+class HashingPool:
+    """
+    Bounded thread pool for password hashing.
+
+    hashlib and argon2-cffi release the GIL while hashing, so running them on a
+    fixed number of threads caps the CPU spent on hashing at ``POOL_WORKERS``
+    cores no matter how many requests are logging in. At most ``POOL_QUEUE``
+    further calls wait for a worker; anything beyond that (or waiting longer
+    than ``POOL_TIMEOUT`` seconds) is rejected with a 503 instead of tying up
+    the request thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._slots = None
+
+    def _ensure_started(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    workers = get_hashing_setting('POOL_WORKERS')
+                    self._slots = threading.BoundedSemaphore(workers + get_hashing_setting('POOL_QUEUE'))
+                    self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+
+    def _call(self, fn, args, kwargs):
+        self._local.active = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._local.active = False
+
+    def run(self, fn, *args, **kwargs):
+        # Hashers call each other (e.g. PBKDF2 verify() calls encode()); run
+        # nested calls inline rather than queueing behind ourselves.
+        if getattr(self._local, 'active', False):
+            return fn(*args, **kwargs)
+
+        self._ensure_started()
+        timeout = get_hashing_setting('POOL_TIMEOUT')
+        if not self._slots.acquire(timeout=timeout):
+            raise HashingPoolBusy()
+        try:
+            return self._executor.submit(self._call, fn, args, kwargs).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self._slots = None
+
+
+hashing_pool = HashingPool()
+
+
+class PooledHasherMixin:
+    """
+    Runs encode() and verify() on the shared hashing pool. The algorithm name
+    is unchanged, so hashes produced by the stock Django hashers still verify.
+    """
+
+    def encode(self, password, salt, *args, **kwargs):
+        return hashing_pool.run(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return hashing_pool.run(super().verify, password, encoded)
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return get_hashing_setting('PBKDF2').get('ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(PooledHasherMixin, hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return get_hashing_setting('SCRYPT').get('WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return get_hashing_setting('SCRYPT').get('BLOCK_SIZE', hashers.ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return get_hashing_setting('SCRYPT').get('PARALLELISM', hashers.ScryptPasswordHasher.parallelism)
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return get_hashing_setting('ARGON2').get('TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return get_hashing_setting('ARGON2').get('MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return get_hashing_setting('ARGON2').get('PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from users.models import OffboardingJob
+from users.offboarding import claimable_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run pending and stalled bulk user deactivation jobs, oldest first.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, help='Only run the job with this ID (may be a failed job)')
+        parser.add_argument('--retry-failed', action='store_true', help='Also re-run failed jobs')
+
+    def handle(self, *args, **options):
+        jobs = claimable_jobs().order_by('created_at')
+        if options['job'] is not None:
+            jobs = jobs.filter(pk=options['job'])
+        elif not options['retry_failed']:
+            jobs = jobs.exclude(status=OffboardingJob.Status.FAILED)
+
+        for job in jobs:
+            try:
+                if not run_job(job):
+                    continue
+            except Exception as exc:
+                self.stderr.write(self.style.ERROR(f'Job {job.pk} failed: {exc}'))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'Job {job.pk}: deactivated {job.deactivated_users} users, '
+                f'reassigned {job.reassigned_tasks} of {job.total_tasks} open tasks.'
+            ))
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:28
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE users_search USING fts5("
+    "email, full_name, content='auth_user', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER users_search_insert AFTER INSERT ON auth_user BEGIN "
+    "INSERT INTO users_search(rowid, email, full_name) VALUES (new.id, new.email, new.full_name); END",
+    "CREATE TRIGGER users_search_delete AFTER DELETE ON auth_user BEGIN "
+    "INSERT INTO users_search(users_search, rowid, email, full_name) VALUES ('delete', old.id, old.email, old.full_name); END",
+    "CREATE TRIGGER users_search_update AFTER UPDATE OF email, full_name ON auth_user BEGIN "
+    "INSERT INTO users_search(users_search, rowid, email, full_name) VALUES ('delete', old.id, old.email, old.full_name); "
+    "INSERT INTO users_search(rowid, email, full_name) VALUES (new.id, new.email, new.full_name); END",
+    "INSERT INTO users_search(users_search) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS users_search_insert",
+    "DROP TRIGGER IF EXISTS users_search_delete",
+    "DROP TRIGGER IF EXISTS users_search_update",
+    "DROP TABLE IF EXISTS users_search",
+]
+POSTGRESQL_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX user_email_trgm_idx ON auth_user USING gin (email gin_trgm_ops)",
+    "CREATE INDEX user_full_name_trgm_idx ON auth_user USING gin (full_name gin_trgm_ops)",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS user_email_trgm_idx",
+    "DROP INDEX IF EXISTS user_full_name_trgm_idx",
+]
+
+
+def run_vendor_sql(statements):
+    # Fuzzy search indexes: pg_trgm GIN indexes on PostgreSQL, an FTS5 table
+    # kept in sync by triggers on SQLite. Other databases only get the prefix
+    # indexes. SQLite migrations that rebuild auth_user drop the triggers;
+    # users.search.restore_search_triggers puts them back after migrate.
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor == 'sqlite':
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+                if not cursor.fetchone()[0]:
+                    return
+        for statement in statements.get(vendor, ()):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0002_offboardingjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['full_name', 'id'], name='user_full_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('full_name'), name='user_full_name_lower_idx'),
+        ),
+        migrations.RunPython(
+            run_vendor_sql({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run_vendor_sql({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
@@ -54,4 +55,56 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.email
 
     class Meta:
-        db_table = 'auth_user'
\ No newline at end of file
+        db_table = 'auth_user'
+        indexes = [
+            # Directory ordering and keyset pagination.
+            models.Index(fields=['full_name', 'id'], name='user_full_name_idx'),
+            # Case-insensitive prefix search (see users/search.py).
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(Lower('full_name'), name='user_full_name_lower_idx'),
+        ]
+
+
+class OffboardingJob(models.Model):
+    """
+    Bulk deactivation of ``user_ids`` with their open tasks reassigned to
+    ``reassign_to``. Run by ``users.offboarding.run_job``; the counters are
+    updated as each chunk commits so clients can poll for progress.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'Pending', 'Pending'
+        RUNNING = 'Running', 'Running'
+        COMPLETED = 'Completed', 'Completed'
+        FAILED = 'Failed', 'Failed'
+
+    user_ids = models.JSONField()
+    reassign_to = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='+'
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    deactivated_users = models.PositiveIntegerField(default=0)
+    total_tasks = models.PositiveIntegerField(default=0)
+    reassigned_tasks = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Offboarding of {len(self.user_ids)} users ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,142 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from tasks.events import broker, task_event
+from tasks.models import Task
+
+from .models import OffboardingJob, User
+from .revocation import revocation_list
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULTS = {
+    'CHUNK_SIZE': 500,
+    'INLINE_MAX_TASKS': 1000,
+    'MAX_USERS': 1000,
+    'BACKGROUND': 'thread',
+    'STALE_AFTER': 600,
+}
+
+
+def get_offboarding_setting(name):
+    return getattr(settings, 'USER_OFFBOARDING', {}).get(name, DEFAULTS[name])
+
+
+def open_tasks(user_ids):
+    return Task.objects.filter(assigned_to_id__in=user_ids).exclude(status=Task.Status.DONE)
+
+
+def reassign_open_tasks(user_ids, assignee_id, batch_size=500):
+    """
+    Reassign the open tasks of ``user_ids`` to ``assignee_id``, one
+    ``batch_size`` UPDATE per transaction; yields the number of tasks
+    reassigned per batch. Done tasks keep their assignee. The previous and
+    new assignees get a task.updated event per task once a batch commits.
+    """
+    while True:
+        with transaction.atomic():
+            previous_assignees = dict(
+                open_tasks(user_ids).select_for_update().order_by()
+                .values_list('id', 'assigned_to_id')[:batch_size]
+            )
+            if not previous_assignees:
+                return
+            tasks = Task.objects.filter(id__in=previous_assignees)
+            tasks.update(assigned_to_id=assignee_id, updated_at=timezone.now())
+            # .update() sends no post_save, so publish the events here.
+            for task in tasks:
+                transaction.on_commit(
+                    lambda event=task_event('task.updated', task, previous_assignees[task.pk]): broker.publish(event)
+                )
+        yield len(previous_assignees)
+
+
+def claimable_jobs():
+    """
+    Jobs ``run_job`` may claim: pending and failed ones, and running ones
+    whose worker has not reported progress for ``STALE_AFTER`` seconds
+    (e.g. it was recycled mid-job).
+    """
+    stale_before = timezone.now() - timedelta(seconds=get_offboarding_setting('STALE_AFTER'))
+    return OffboardingJob.objects.filter(
+        Q(status__in=[OffboardingJob.Status.PENDING, OffboardingJob.Status.FAILED])
+        | Q(status=OffboardingJob.Status.RUNNING, heartbeat_at__lt=stale_before)
+    )
+
+
+def run_job(job):
+    """
+    Run a job: deactivate its users, revoke their tokens, then reassign
+    their open tasks chunk by chunk. Failed and stalled jobs can be run
+    again (see ``claimable_jobs``), as every step only touches rows that
+    still need it. Returns False if the job could not be claimed (e.g.
+    another worker is running it).
+    """
+    now = timezone.now()
+    claimed = claimable_jobs().filter(pk=job.pk).update(
+        status=OffboardingJob.Status.RUNNING, started_at=now, heartbeat_at=now, error='', finished_at=None
+    )
+    if not claimed:
+        return False
+    job.refresh_from_db()
+
+    try:
+        job.deactivated_users += User.objects.filter(pk__in=job.user_ids, is_active=True).update(is_active=False)
+        for user_id in job.user_ids:
+            revocation_list.revoke_user(user_id)
+        job.total_tasks = job.reassigned_tasks + open_tasks(job.user_ids).count()
+        job.save(update_fields=['deactivated_users', 'total_tasks'])
+
+        for reassigned in reassign_open_tasks(job.user_ids, job.reassign_to_id, get_offboarding_setting('CHUNK_SIZE')):
+            job.reassigned_tasks += reassigned
+            job.heartbeat_at = timezone.now()
+            job.save(update_fields=['reassigned_tasks', 'heartbeat_at'])
+    except Exception as exc:
+        logger.exception('Offboarding job %s failed', job.pk)
+        job.status = OffboardingJob.Status.FAILED
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        raise
+
+    job.status = OffboardingJob.Status.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at'])
+    return True
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(OffboardingJob.objects.get(pk=job_id))
+    except Exception:
+        pass  # Logged and recorded on the job by run_job.
+    finally:
+        connections.close_all()
+
+
+def start_in_background(job):
+    """
+    Queue a job to run outside the request. With ``BACKGROUND = 'thread'`` it
+    runs in a single worker thread of this process once the current
+    transaction commits; with ``'command'`` it is left pending for
+    ``python manage.py run_offboarding_jobs``.
+    """
+    global _executor
+    if get_offboarding_setting('BACKGROUND') != 'thread':
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='offboarding')
+    transaction.on_commit(lambda: _executor.submit(_run_in_thread, job.pk))
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the user directory: each page continues from the
+    last (full_name, id) seen instead of counting an OFFSET, so deep pages
+    and inserts between requests neither slow it down nor shift results.
+    """
+    ordering = ('full_name', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,182 @@
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'default',
+    'KEY_PREFIX': 'revocation',
+    'BLOOM_CAPACITY': 100_000,
+    'BLOOM_ERROR_RATE': 0.001,
+    'SYNC_INTERVAL': 5,
+}
+
+
+def get_revocation_setting(name):
+    return getattr(settings, 'TOKEN_REVOCATION', {}).get(name, DEFAULTS[name])
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over string keys. Membership tests may return
+    false positives but never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationList:
+    """
+    Revoked token JTIs and user IDs, checked without touching the database.
+
+    The cache holds the exact entries, each expiring with the lifetime of the
+    tokens it revokes. Every process keeps a bloom filter in front of it so the
+    common case (token not revoked) is answered from memory. Revocations are
+    also appended to a numbered log in the cache, which other processes replay
+    into their own filter at most every ``SYNC_INTERVAL`` seconds.
+
+    A full filter is rebuilt from the log entries that may still be live,
+    sized at twice their number (never below ``BLOOM_CAPACITY``). Each sync
+    notes the log version it reached and when; every entry up to that version
+    expires within one token lifetime of that time, so a rebuild replays only
+    the entries recorded after the newest such note that has aged past the
+    lifetime. A fresh process has no notes and replays the last
+    ``BLOOM_CAPACITY`` entries. When that cannot cover every entry that may
+    still be live, lookups go to the cache until those entries have expired,
+    so a miss in the filter is never trusted blindly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._start = 1
+        self._version = 0
+        self._checkpoints = deque()
+        self._last_sync = 0.0
+        self._exact_until = 0.0
+
+    @property
+    def cache(self):
+        return caches[get_revocation_setting('CACHE_ALIAS')]
+
+    def _key(self, *parts):
+        return ':'.join((get_revocation_setting('KEY_PREFIX'),) + tuple(str(p) for p in parts))
+
+    def _lifetime(self):
+        return max(
+            settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'],
+            settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'],
+        ).total_seconds()
+
+    def _checkpoint(self, version, now):
+        # Called with the lock held. Every entry up to ``version`` was recorded
+        # by ``now``. Notes closer together than 1/64 of the lifetime are
+        # merged, which keeps at most ~64 of them per lifetime.
+        if self._checkpoints and now - self._checkpoints[-1][1] < self._lifetime() / 64:
+            self._checkpoints[-1] = (version, now)
+        else:
+            self._checkpoints.append((version, now))
+
+    def _rebuild(self, version):
+        # Called with the lock held.
+        capacity = get_revocation_setting('BLOOM_CAPACITY')
+        if self._bloom is None:
+            start = max(1, version - capacity + 1)
+            if start > 1:
+                # Older log entries are not replayed and may still be live.
+                self._exact_until = time.monotonic() + self._lifetime()
+        else:
+            start = self._start
+            expired_before = time.time() - self._lifetime()
+            while self._checkpoints and self._checkpoints[0][1] <= expired_before:
+                start = max(start, self._checkpoints.popleft()[0] + 1)
+        entries = self._fetch(start, version)
+        self._bloom = BloomFilter(max(capacity, 2 * len(entries)), get_revocation_setting('BLOOM_ERROR_RATE'))
+        for entry in entries:
+            self._bloom.add(entry)
+        self._start = start
+        self._version = version
+
+    def _fetch(self, start, end):
+        keys = [self._key('log', n) for n in range(start, end + 1)]
+        return list(self.cache.get_many(keys).values())
+
+    def _sync(self, force=False):
+        now = time.monotonic()
+        if not force and self._bloom is not None and now - self._last_sync < get_revocation_setting('SYNC_INTERVAL'):
+            return
+        with self._lock:
+            self._last_sync = now
+            version = self.cache.get(self._key('version'), 0)
+            synced_at = time.time()
+            if self._bloom is None or self._bloom.count + version - self._version > self._bloom.capacity:
+                self._rebuild(version)
+            elif version > self._version:
+                for entry in self._fetch(self._version + 1, version):
+                    self._bloom.add(entry)
+                self._version = version
+            self._checkpoint(version, synced_at)
+
+    def _record(self, entry, value, timeout):
+        timeout = max(1, int(timeout))
+        self.cache.set(self._key(entry), value, timeout)
+        version_key = self._key('version')
+        self.cache.add(version_key, 0, None)
+        version = self.cache.incr(version_key)
+        self.cache.set(self._key('log', version), entry, timeout)
+        self._sync(force=True)
+
+    def _lookup(self, entry):
+        self._sync()
+        if entry not in self._bloom and time.monotonic() >= self._exact_until:
+            return None
+        return self.cache.get(self._key(entry))
+
+    def revoke_token(self, jti, exp):
+        self._record(f'jti:{jti}', 1, exp - time.time())
+
+    def is_token_revoked(self, jti):
+        return self._lookup(f'jti:{jti}') is not None
+
+    def revoke_user(self, user_id):
+        self._record(f'user:{user_id}', int(time.time()), self._lifetime())
+
+    def is_user_revoked(self, user_id, issued_at):
+        revoked_at = self._lookup(f'user:{user_id}')
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+            self._start = 1
+            self._version = 0
+            self._checkpoints.clear()
+            self._last_sync = 0.0
+            self._exact_until = 0.0
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,124 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+SEARCH_TABLE = 'users_search'
+
+# Keep users_search in step with auth_user on SQLite. Same statements as
+# migration 0003; SQLite drops them whenever a migration rebuilds auth_user.
+SEARCH_TRIGGERS = {
+    'users_search_insert':
+        "CREATE TRIGGER users_search_insert AFTER INSERT ON auth_user BEGIN "
+        "INSERT INTO users_search(rowid, email, full_name) VALUES (new.id, new.email, new.full_name); END",
+    'users_search_delete':
+        "CREATE TRIGGER users_search_delete AFTER DELETE ON auth_user BEGIN "
+        "INSERT INTO users_search(users_search, rowid, email, full_name) "
+        "VALUES ('delete', old.id, old.email, old.full_name); END",
+    'users_search_update':
+        "CREATE TRIGGER users_search_update AFTER UPDATE OF email, full_name ON auth_user BEGIN "
+        "INSERT INTO users_search(users_search, rowid, email, full_name) "
+        "VALUES ('delete', old.id, old.email, old.full_name); "
+        "INSERT INTO users_search(rowid, email, full_name) VALUES (new.id, new.email, new.full_name); END",
+}
+
+_search_tables = {}
+
+
+def has_search_table(connection):
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _search_tables:
+        _search_tables[key] = SEARCH_TABLE in connection.introspection.table_names()
+    return _search_tables[key]
+
+
+def restore_search_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate handler: recreate any missing FTS5 sync trigger and rebuild
+    users_search from auth_user, so search doesn't silently go stale after a
+    migration that rebuilt the table.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or SEARCH_TABLE not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'auth_user'")
+        existing = {name for name, in cursor.fetchall()}
+        missing = [name for name in SEARCH_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SEARCH_TRIGGERS[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def prefix_bounds(term):
+    # ``LOWER(col) >= term AND LOWER(col) < upper`` is a range scan on the
+    # LOWER() expression indexes; LIKE 'term%' would not use them.
+    return term, term[:-1] + chr(ord(term[-1]) + 1)
+
+
+def fuzzy_match(connection, table, term):
+    """
+    Subquery of user IDs fuzzily matching ``term``, or None when the database
+    has no fuzzy index: trigram word similarity on PostgreSQL (pg_trgm), word
+    prefix matching through the FTS5 table on SQLite.
+    """
+    if connection.vendor == 'postgresql':
+        table = connection.ops.quote_name(table)
+        return RawSQL(f'SELECT id FROM {table} WHERE %s <%% full_name OR %s <%% email', [term, term])
+    if connection.vendor == 'sqlite' and has_search_table(connection):
+        words = re.findall(r'\w+', term)
+        if words:
+            query = ' '.join(f'"{word}"*' for word in words)
+            return RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [query])
+    return None
+
+
+def search_users(queryset, term):
+    """
+    Users whose email or full name starts with ``term``, or fuzzily matches
+    it (see ``fuzzy_match``).
+    """
+    term = term.strip().lower()
+    if not term:
+        return queryset
+    low, high = prefix_bounds(term)
+    queryset = queryset.alias(email_lower=Lower('email'), full_name_lower=Lower('full_name'))
+    condition = Q(email_lower__gte=low, email_lower__lt=high) | Q(full_name_lower__gte=low, full_name_lower__lt=high)
+
+    fuzzy = fuzzy_match(connections[queryset.db], queryset.model._meta.db_table, term)
+    if fuzzy is not None:
+        condition |= Q(pk__in=fuzzy)
+    return queryset.filter(condition)
+
+
+class UserSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        return search_users(queryset, request.query_params.get(self.search_param, ''))
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Prefix or fuzzy match on email and full name',
+            'schema': {'type': 'string'},
+        }]
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    Appends ``id`` to the requested ordering so users with the same name have
+    a fixed order, which cursor pagination needs to page through them.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or ())
+        if ordering and ordering[-1].lstrip('-') != 'id':
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
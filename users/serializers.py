@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.password_validation import validate_password
-from drf_spectacular.utils import extend_schema_field
-from drf_spectacular.openapi import OpenApiExample
+from drf_spectacular.utils import extend_schema_field, OpenApiExample
+from .models import OffboardingJob
+from .tokens import RevocableRefreshToken
 
 User = get_user_model()
 
@@ -53,6 +54,8 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RevocableRefreshToken
+
     def validate(self, attrs):
         authenticate_kwargs = {
             self.username_field: attrs[self.username_field],
@@ -76,4 +79,50 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['refresh'] = str(refresh)
         data['access'] = str(refresh.access_token)
 
-        return data
\ No newline at end of file
+        return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+
+class BulkDeactivateSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        help_text="IDs of the users to deactivate"
+    )
+    reassign_to = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.filter(is_active=True),
+        help_text="ID of the active user who takes over their open tasks"
+    )
+
+    def validate_user_ids(self, value):
+        from .offboarding import get_offboarding_setting
+
+        user_ids = sorted(set(value))
+        max_users = get_offboarding_setting('MAX_USERS')
+        if len(user_ids) > max_users:
+            raise serializers.ValidationError(f"At most {max_users} users can be deactivated at once.")
+        missing = set(user_ids) - set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(f"Unknown user IDs: {', '.join(map(str, sorted(missing)))}")
+        request = self.context.get('request')
+        if request is not None and request.user.pk in user_ids:
+            raise serializers.ValidationError("You cannot deactivate yourself.")
+        return user_ids
+
+    def validate(self, attrs):
+        if attrs['reassign_to'].pk in attrs['user_ids']:
+            raise serializers.ValidationError({'reassign_to': "Cannot reassign tasks to a user being deactivated."})
+        return attrs
+
+
+class OffboardingJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OffboardingJob
+        fields = (
+            'id', 'status', 'user_ids', 'reassign_to', 'deactivated_users', 'total_tasks',
+            'reassigned_tasks', 'error', 'created_at', 'started_at', 'finished_at'
+        )
+        read_only_fields = fields
@@ -0,0 +1,38 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .revocation import revocation_list
+
+
+class RevocableTokenMixin:
+    """
+    Checks tokens against the in-process revocation list instead of the
+    database-backed ``token_blacklist`` app.
+    """
+
+    def verify(self, *args, **kwargs):
+        self.check_revoked()
+        super().verify(*args, **kwargs)
+
+    def check_revoked(self):
+        jti = self.payload.get(api_settings.JTI_CLAIM)
+        if jti and revocation_list.is_token_revoked(jti):
+            raise TokenError(_('Token is blacklisted'))
+
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        issued_at = self.payload.get('iat')
+        if user_id is not None and issued_at is not None and revocation_list.is_user_revoked(user_id, issued_at):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        revocation_list.revoke_token(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+
+
+class RevocableAccessToken(RevocableTokenMixin, AccessToken):
+    pass
+
+
+class RevocableRefreshToken(RevocableTokenMixin, RefreshToken):
+    access_token_class = RevocableAccessToken
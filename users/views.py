@@ -2,12 +2,24 @@ from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.reverse import reverse
 from rest_framework import viewsets
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample
-from drf_spectacular.openapi import OpenApiParameter
-from .serializers import UserRegistrationSerializer, UserSerializer, CustomTokenObtainPairSerializer
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample, OpenApiParameter
+from task_manager.budgets import QueryBudgetMixin
+from .serializers import (
+    UserRegistrationSerializer, UserSerializer, CustomTokenObtainPairSerializer,
+    BulkDeactivateSerializer, OffboardingJobSerializer,
+)
+from .filters import UserFilter
+from .models import OffboardingJob
+from .offboarding import get_offboarding_setting, open_tasks, run_job, start_in_background
+from .pagination import UserCursorPagination
+from .revocation import revocation_list
+from .search import StableOrderingFilter, UserSearchFilter
 
 User = get_user_model()
 
@@ -61,11 +73,22 @@ class RegisterView(generics.CreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class UserDirectoryMixin:
+    """
+    Search (``?search=``), ``?role=``/``?is_active=`` filters, ``?ordering=``
+    by full_name or email, and cursor pagination for user lists.
+    """
+    filter_backends = [DjangoFilterBackend, UserSearchFilter, StableOrderingFilter]
+    filterset_class = UserFilter
+    ordering_fields = ['full_name', 'email']
+    pagination_class = UserCursorPagination
+
+
 @extend_schema(
     summary="List all users",
-    description="Get a list of all users (Admin only)"
+    description="Get a list of all users (Admin only). Supports search, role/is_active filters and cursor pagination."
 )
-class UserListView(generics.ListAPIView):
+class UserListView(UserDirectoryMixin, generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
@@ -74,7 +97,8 @@ class UserListView(generics.ListAPIView):
 @extend_schema_view(
     list=extend_schema(
         summary="List users",
-        description="Get a paginated list of all users (Admin only)"
+        description="Get a cursor-paginated list of users (Admin only). "
+                    "?search= matches email and full name by prefix or fuzzily; filter with ?role= and ?is_active=."
     ),
     retrieve=extend_schema(
         summary="Get user details",
@@ -107,14 +131,28 @@ class UserListView(generics.ListAPIView):
                 }
             )
         ]
+    ),
+    bulk_deactivate=extend_schema(
+        summary="Bulk deactivate users",
+        description="Deactivate many users, revoke their tokens and reassign their open tasks (Admin only). "
+                    "Small jobs run inline and return 200, or 500 with the failed job; larger ones return 202 "
+                    "and run in the background. Poll the job for progress.",
+        request=BulkDeactivateSerializer,
+        responses={200: OffboardingJobSerializer, 202: OffboardingJobSerializer, 500: OffboardingJobSerializer}
+    ),
+    offboarding_job=extend_schema(
+        summary="Get bulk deactivation job",
+        description="Progress of a bulk deactivation job (Admin only)",
+        responses=OffboardingJobSerializer
     )
 )
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, UserDirectoryMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
+    query_budget_scope = 'users'
     serializer_class = UserSerializer
     
     def get_permissions(self):
-        if self.action == 'soft_delete':
+        if self.action in ['soft_delete', 'bulk_deactivate', 'offboarding_job']:
             self.permission_classes = [permissions.IsAuthenticated]
         else:
             self.permission_classes = [permissions.IsAdminUser]
@@ -130,8 +168,53 @@ class UserViewSet(viewsets.ModelViewSet):
         
         user = self.get_object()
         user.is_active = False
-        user.save()
+        user.save(update_fields=['is_active'])
+        revocation_list.revoke_user(user.pk)
         
         return Response({
             'message': f'User {user.email} has been soft deleted'
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='bulk-deactivate')
+    def bulk_deactivate(self, request):
+        if request.user.role != 'Admin':
+            return Response(
+                {'error': 'Only admins can deactivate users'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = BulkDeactivateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        user_ids = serializer.validated_data['user_ids']
+        job = OffboardingJob.objects.create(
+            user_ids=user_ids,
+            reassign_to=serializer.validated_data['reassign_to'],
+            created_by=request.user
+        )
+
+        location = reverse('user-offboarding-job', kwargs={'job_id': job.pk}, request=request)
+        if open_tasks(user_ids).count() <= get_offboarding_setting('INLINE_MAX_TASKS'):
+            try:
+                run_job(job)
+            except Exception:
+                # Logged and recorded on the job (status Failed) by run_job.
+                return Response(
+                    OffboardingJobSerializer(job).data,
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    headers={'Location': location}
+                )
+            return Response(OffboardingJobSerializer(job).data, status=status.HTTP_200_OK)
+
+        start_in_background(job)
+        return Response(OffboardingJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+    @action(detail=False, methods=['get'], url_path=r'offboarding-jobs/(?P<job_id>[0-9]+)')
+    def offboarding_job(self, request, job_id=None):
+        if request.user.role != 'Admin':
+            return Response(
+                {'error': 'Only admins can view deactivation jobs'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        job = get_object_or_404(OffboardingJob, pk=job_id)
+        return Response(OffboardingJobSerializer(job).data)